@@ -0,0 +1,56 @@
+"""
+Compare rendering the export tables one after another with render_tables.
+
+    python bench_exports.py                 # three 20k-row tables to xlsx
+    python bench_exports.py --rows 50000 --tables 4 --format csv
+
+render_tables only uses worker processes with more than one CPU, so on a
+single-core machine both timings are the same.
+"""
+import argparse
+import os
+import time
+from datetime import time as clock
+
+import pandas as pd
+
+from exportfiles import render_tables, table_to_bytes
+
+
+def sample(rows):
+    n = pd.RangeIndex(rows)
+    return pd.DataFrame({
+        'Subject': 'MATH',
+        'Number': (1000 + n % 900).astype(str),
+        'Section': (n // 900).map('{:03d}'.format),
+        'Instructor Name': 'I' + (n % 300).astype(str),
+        'Meeting Days': 'MWF',
+        'Beginning Time': [clock(8 + i % 9) for i in n],
+        'Ending Time': [clock(8 + i % 9, 50) for i in n],
+        'Room': 'COR ' + (n % 80).astype(str),
+        'Credits': 3,
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--tables', type=int, default=3)
+    parser.add_argument('--format', default='xlsx')
+    args = parser.parse_args(argv)
+
+    tables = {f'table_{n}': sample(args.rows) for n in range(args.tables)}
+    t = time.perf_counter()
+    for df in tables.values():
+        table_to_bytes(df, args.format)
+    serial = time.perf_counter() - t
+    t = time.perf_counter()
+    render_tables(tables, (args.format,))
+    pooled = time.perf_counter() - t
+    print(f"{args.tables} x {args.rows} rows to {args.format} on {os.cpu_count()} CPUs")
+    print(f"one after another  {serial:7.2f} s")
+    print(f"render_tables      {pooled:7.2f} s  ({serial / pooled:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Measure cold import time of the app modules, each in a fresh interpreter,
+relative to a plain `import pandas` timed alongside them.
+
+    python bench_imports.py            # report and check the budgets
+    python bench_imports.py --runs 10
+
+Fails (exit status 1) when a module goes over its budget or pulls in one
+of the heavy optional modules it is supposed to import lazily.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+# module -> import time as a multiple of `import pandas` on the same
+# machine. Each is about 1.3x the ratio measured when it was set (1.03-1.08:
+# pandas is most of the cost), so a real regression fails instead of hiding
+# in the slack, while a slower or busier machine does not.
+BASELINE = 'pandas'
+BUDGETS = {
+    'check': 1.35,
+    'conflicts': 1.35,
+    'readfiles': 1.35,
+    'generateoutput': 1.40,
+}
+
+# What to import for a budget, when it is more than the module itself:
+# check.py defers its real imports into main(), so time those too.
+IMPORTS = {
+    'check': 'import check, readfiles, conflicts',
+}
+
+LAZY = ['openpyxl', 'IPython', 'excelsheets', 'streamlit']
+
+PROBE = """
+import json, sys, time
+t = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - t
+print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def probe(module):
+    out = subprocess.run(
+        [sys.executable, '-c', PROBE.format(imports=IMPORTS.get(module, f'import {module}'), lazy=LAZY)],
+        capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+    )
+    return json.loads(out.stdout)
+
+
+def measure(module, runs=5):
+    """
+    Fastest import time of `module` and of the baseline, probed in turn so
+    both see the same machine load, plus any lazy modules it pulled in.
+    """
+    times, base, loaded = [], [], set()
+    for _ in range(runs):
+        base.append(probe(BASELINE)['elapsed'])
+        result = probe(module)
+        times.append(result['elapsed'])
+        loaded.update(result['loaded'])
+    return min(times), min(base), sorted(loaded)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module, budget in BUDGETS.items():
+        elapsed, base, loaded = measure(module, args.runs)
+        ratio = elapsed / base
+        ok = ratio <= budget and not loaded
+        failed |= not ok
+        extra = f"  eagerly loads {', '.join(loaded)}" if loaded else ''
+        print(f"{'ok  ' if ok else 'FAIL'} {module:<16} {elapsed * 1000:8.1f} ms  "
+              f"{ratio:5.2f}x {BASELINE} (budget {budget:.2f}x){extra}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,102 +2,43 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from readfiles import read_from_file, parse_time
+from summaries import touch
+from normalize import key_mask, key_of, credits_from_number
 
 
 def assign_section(df, subject, cnumber, section, instructor):
-    df.loc[
-        (df['Subject'] == subject) &
-        (df['Number'] == str(cnumber)) &
-        (df['Section'] == section),
-        'Instructor Name'
-    ] = instructor
-    return df.loc[
-        (df['Subject']==subject) &
-        (df['Number']==str(cnumber)) &
-        (df['Section']==section)
-    ]
+    mask = key_mask(df, subject, cnumber, section)
+    df.loc[mask, 'Instructor Name'] = instructor
+    touch(df, subject, cnumber, section)
+    return df.loc[mask]
 
 def assign_room(df, subject, cnumber, section, room, days=None):
-    if days is None:
-        df.loc[
-            (df['Subject'] == subject) &
-            (df['Number'] == str(cnumber)) &
-            (df['Section'] == section),
-            'Room'
-        ] = room
-    else:
-        df.loc[
-            (df['Subject'] == subject) &
-            (df['Number'] == str(cnumber)) &
-            (df['Section'] == section) &
-            (df['Meeting Days'] == days),
-            'Room'
-        ] = room
-    return df.loc[
-        (df['Subject']==subject) &
-        (df['Number']==str(cnumber)) &
-        (df['Section']==section)
-    ]
+    mask = key_mask(df, subject, cnumber, section)
+    df.loc[key_mask(df, subject, cnumber, section, days), 'Room'] = room
+    touch(df, subject, cnumber, section)
+    return df.loc[mask]
 
 def assign_time(df, subject, cnumber, section, newtime, days=None, duration=50):
     btime = parse_time(str(newtime))
     dt = datetime.combine(datetime.now().date(), btime)
     etime = (dt + timedelta(minutes=duration)).time()
-    if days is None:
-        df.loc[
-            (df['Subject'] == subject) &
-            (df['Number'] == str(cnumber)) &
-            (df['Section'] == section),
-            'Beginning Time'
-        ] = btime
-        df.loc[
-            (df['Subject'] == subject) &
-            (df['Number'] == str(cnumber)) &
-            (df['Section'] == section),
-            'Ending Time'
-        ] = etime
-    else:
-        df.loc[
-            (df['Subject'] == subject) &
-            (df['Number'] == str(cnumber)) &
-            (df['Section'] == section) &
-            (df['Meeting Days'] == days),
-            'Beginning Time'
-        ] = btime
-        df.loc[
-            (df['Subject'] == subject) &
-            (df['Number'] == str(cnumber)) &
-            (df['Section'] == section) &
-            (df['Meeting Days'] == days),
-            'Ending Time'
-        ] = etime
-    return df.loc[
-        (df['Subject']==subject) &
-        (df['Number']==str(cnumber)) &
-        (df['Section']==section)
-    ]
+    mask = key_mask(df, subject, cnumber, section)
+    rows = key_mask(df, subject, cnumber, section, days)
+    df.loc[rows, 'Beginning Time'] = btime
+    df.loc[rows, 'Ending Time'] = etime
+    touch(df, subject, cnumber, section)
+    return df.loc[mask]
 
 def assign_days(df, subject, cnumber, section, olddays, newdays):
-    df.loc[
-        (df['Subject'] == subject) &
-        (df['Number'] == str(cnumber)) &
-        (df['Section'] == section) &
-        (df['Meeting Days'] == olddays),
-        'Meeting Days'
-    ] = newdays
-    return df.loc[
-        (df['Subject']==subject) &
-        (df['Number']==str(cnumber)) &
-        (df['Section']==section)
-    ]
+    mask = key_mask(df, subject, cnumber, section)
+    df.loc[key_mask(df, subject, cnumber, section, olddays), 'Meeting Days'] = newdays
+    touch(df, subject, cnumber, section)
+    return df.loc[mask]
 
 def remove_section(df, subject, cnumber, section):
-    df = df.loc[
-        (df['Subject']!=subject) | 
-        (df['Number']!=str(cnumber)) | 
-        (df['Section']!=section)
-    ]
-    return df
+    sf = df.loc[~key_mask(df, subject, cnumber, section)]
+    touch(df, subject, cnumber, section, new_df=sf)
+    return sf
 
 def add_section(df, subject, cnumber, section, instructor,
                 days=np.nan, btime=np.nan, etime=np.nan, room=np.nan):
@@ -108,16 +49,42 @@ def add_section(df, subject, cnumber, section, instructor,
         'Number': [str(cnumber)],
         'Section': [section],
         'Instructor Name':[instructor],
-        'Credits': int(cnumber) %10,
+        'Credits': credits_from_number(pd.Series([cnumber])),
         'Meeting Days': days,
         'Beginning Time': btime,
         'Ending Time': etime,
         'Room': room,
+        'Key': key_of(subject, cnumber, section),
         })
-    df = pd.concat([df, newrow], ignore_index=True)
+    sf = pd.concat([df, newrow], ignore_index=True)
+    touch(df, subject, cnumber, section, new_df=sf)
+    return sf
+
+
+def apply_edits(df, edits):
+    """
+    Apply a list of edits such as those proposed by rebalance.py.
+    Each edit is a dict with an `op` naming one of the helpers above and
+    that helper's keyword arguments.
+    """
+    for edit in edits:
+        args = {k: v for k, v in edit.items() if k != 'op'}
+        result = EDITS[edit['op']](df, **args)
+        if edit['op'] in ('remove_section', 'add_section'):
+            df = result
     return df
 
 
+EDITS = {
+    'assign_section': assign_section,
+    'assign_room': assign_room,
+    'assign_time': assign_time,
+    'assign_days': assign_days,
+    'remove_section': remove_section,
+    'add_section': add_section,
+}
+
+
 if __name__ == '__main__':
     sf = read_from_file('src/26s_init.csv')
     sf = remove_section(sf, 'MATH', 1914, '001')
@@ -0,0 +1,43 @@
+"""
+Print the instructor and room conflicts of a schedule file.
+
+    python check.py "src/MAPS 202620.xlsx"
+    python check.py university.csv --subject MATH --subject STAT
+
+Only the reader and the conflict checks are imported, so this starts much
+faster than the Streamlit app or save_reports. Exits with status 1 when
+conflicts are found.
+"""
+import argparse
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check a class schedule for conflicts')
+    parser.add_argument('filename')
+    parser.add_argument('--subject', action='append', dest='subjects',
+                        help='only keep these subjects (CSV exports are streamed)')
+    parser.add_argument('--department', action='append', dest='departments')
+    args = parser.parse_args(argv)
+
+    from readfiles import read_from_file
+    from conflicts import (
+        check_instructor_conflicts_matrix,
+        md_instructor_matrix_conflicts,
+        check_room_conflicts_matrix,
+        md_room_matrix_conflicts,
+    )
+
+    try:
+        df = read_from_file(args.filename, subjects=args.subjects, departments=args.departments)
+    except ValueError as e:
+        parser.error(str(e))
+    instructor_conflicts = check_instructor_conflicts_matrix(df)
+    room_conflicts = check_room_conflicts_matrix(df)
+    print(md_instructor_matrix_conflicts(instructor_conflicts))
+    print(md_room_matrix_conflicts(room_conflicts))
+    return 1 if instructor_conflicts or room_conflicts else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
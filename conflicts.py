@@ -1,93 +1,181 @@
 from collections import defaultdict
 
-def check_instructor_conflicts_matrix(df):
+import numpy as np
+import pandas as pd
+
+from normalize import keys_of
+
+
+DAYS = ['M', 'T', 'W', 'R', 'F']
+
+
+def time_to_minutes(s):
+    """Minutes since midnight for a column of datetime.time values (NaN stays NaN)."""
+    return pd.to_timedelta(s.astype(str), errors='coerce').dt.total_seconds() // 60
+
+
+def meeting_frame(df):
     """
-    Check instructor conflicts using time-day matrix approach.
-    Much more efficient than pairwise comparison.
+    One row per section per meeting day, with start/end in minutes.
+    Online sections (no days or no time) are left out.
+    The original row label is kept in the `row` column.
     """
-    # Filter out online courses and empty data
     data = df[df['Meeting Days'].notna() & df['Beginning Time'].notna()]
-    
+    base = data.assign(
+        row=data.index,
+        start=time_to_minutes(data['Beginning Time']),
+        end=time_to_minutes(data['Ending Time']),
+    )
+    days = base['Meeting Days'].str.upper()
+    frames = [base[days.str.contains(d, regex=False)].assign(day=d) for d in DAYS]
+    return pd.concat(frames, ignore_index=True)
+
+
+def date_bounds(mf):
+    """
+    Start/end of each meeting's date range as day numbers.
+    Sections without dates are treated as running the whole term, so a
+    missing date becomes -inf/+inf (the day numbers are floats).
+    """
+    def days(column, missing):
+        if column not in mf.columns:
+            return np.full(len(mf), missing)
+        d = pd.to_datetime(mf[column], errors='coerce')
+        return (d.dt.normalize() - pd.Timestamp(0)).dt.days.to_numpy(float, na_value=missing)
+
+    return days('Start Date', -np.inf), days('End Date', np.inf)
+
+
+def overlapping_pairs(mf, key):
+    """
+    All pairs of meetings with the same `key` and day that overlap both in
+    time of day and in calendar dates.
+
+    Meetings are sorted by (key, day, start); for each meeting a binary search
+    finds the later meetings that start before it ends, which are exactly its
+    time overlaps. Only those candidates have their date ranges compared,
+    so the work follows the number of overlaps rather than all pairs.
+    """
+    mf = mf.sort_values([key, 'day', 'start'], kind='stable').reset_index(drop=True)
+    group = mf.groupby([key, 'day'], sort=False).ngroup().to_numpy(np.int64)
+    # Place each (key, day) on its own stretch of one number line.
+    span = 24 * 60 + 1
+    start = group * span + mf['start'].to_numpy(np.int64)
+    end = group * span + mf['end'].to_numpy(np.int64)
+
+    idx = np.arange(len(mf))
+    stop = np.searchsorted(start, end, side='left')
+    counts = np.maximum(stop - idx - 1, 0)
+    i = np.repeat(idx, counts)
+    offsets = np.arange(len(i)) - np.repeat(np.cumsum(counts) - counts, counts)
+    j = i + 1 + offsets
+
+    date_start, date_end = date_bounds(mf)
+    same_dates = (date_start[j] <= date_end[i]) & (date_start[i] <= date_end[j])
+    return mf, i[same_dates], j[same_dates]
+
+
+def key_name(key):
+    return {'Instructor Name': 'instructor', 'Room': 'room'}[key]
+
+
+def components(i, j):
+    """Connected components of the overlap graph given by pairs (i, j), by union-find."""
+    parent = {}
+
+    def find(x):
+        while parent.setdefault(x, x) != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in zip(i.tolist(), j.tolist()):
+        parent[find(a)] = find(b)
+    groups = defaultdict(list)
+    for x in sorted(parent):
+        groups[find(x)].append(x)
+    return list(groups.values())
+
+
+def clashes(mf, i, j):
+    """
+    Maximal sets of meetings that are all going on at one moment (same
+    time of day and same date), so a chain like 9:00-10:15, 10:00-10:50,
+    10:40-11:30 gives two clashes rather than one.
+
+    Each meeting is a box in (time of day, date); boxes that pairwise
+    overlap share a point whose corner is (latest start, latest start
+    date) of the set, so only those corners need checking, and only
+    within each connected component of the overlap graph.
+    """
+    start, end = mf['start'].to_numpy(), mf['end'].to_numpy()
+    date_start, date_end = date_bounds(mf)
+    groups = []
+    for nodes in components(i, j):
+        nodes = np.array(nodes)
+        s, e, ds, de = start[nodes], end[nodes], date_start[nodes], date_end[nodes]
+        found = set()
+        for t in np.unique(s):
+            for d in np.unique(ds):
+                active = (s <= t) & (t < e) & (ds <= d) & (d <= de)
+                if active.sum() > 1:
+                    found.add(frozenset(nodes[active].tolist()))
+        groups.extend(sorted(c) for c in found if not any(c < other for other in found))
+    return groups
+
+
+def conflict_groups(mf, key, details):
+    """
+    Find the clashes among the meetings of each `key` value and describe
+    each like the old time-day matrix cells.
+    `details` maps the keys of each course entry to columns of `mf`.
+    """
+    mf = mf[mf[key].notna()]
+    mf = mf.assign(end=mf['end'].fillna(mf['start'] + 1))
+    mf, i, j = overlapping_pairs(mf, key)
+    groups = sorted(clashes(mf, i, j))
+
+    nodes = [x for g in groups for x in g]
+    rows = mf.iloc[nodes].assign(
+        group=np.repeat(np.arange(len(groups)), [len(g) for g in groups]),
+        course=keys_of,
+    )
+    courses = rows[list(details.values())].set_axis(list(details), axis=1).to_dict('records')
+    first = rows.groupby('group', sort=False).agg(
+        key=(key, 'first'), day=('day', 'first'), time_slot=('Beginning Time', 'min'), size=('day', 'size'),
+    )
+    bounds = np.cumsum([0, *first['size'].tolist()])
+
     conflicts = []
-    
-    # Group by instructor
-    for instructor, group in data.groupby('Instructor Name'):
-        matrix = defaultdict(lambda: {'M': 0, 'T': 0, 'W': 0, 'R': 0, 'F': 0})
-        course_details = defaultdict(lambda: defaultdict(list))  # Store course info
-        
-        for _, row in group.iterrows():
-            start_time = row['Beginning Time']
-            meeting_days = row['Meeting Days'].upper()
-            course_info = {
-                'course': f"{row['Subject']}{row['Number']}-{row['Section']}",
-                'room': f"{row['Room']}".strip()
-            }
-            
-            # Parse meeting days
-            for char in meeting_days:
-                if char in ['M', 'T', 'W', 'R', 'F']:
-                    matrix[start_time][char] += 1
-                    course_details[start_time][char].append(course_info)
-        
-            
-        # Check for conflicts (any cell > 1)
-        for time_slot, day_counts in matrix.items():
-            for day, count in day_counts.items():
-                if count > 1:
-                    courses = course_details[time_slot][day]
-                    conflicts.append({
-                        'instructor': instructor,
-                        'time_slot': time_slot,
-                        'day': day,
-                        'count': count,
-                        'courses': courses
-                    })
-    
+    for n, g in enumerate(first.itertuples(index=False)):
+        conflicts.append({
+            key_name(key): g.key,
+            'time_slot': g.time_slot,
+            'day': g.day,
+            'count': g.size,
+            'courses': courses[bounds[n]:bounds[n + 1]],
+        })
+    day_order = {d: n for n, d in enumerate(DAYS)}
+    conflicts.sort(key=lambda c: (str(c[key_name(key)]), day_order[c['day']], c['time_slot']))
     return conflicts
 
+
+def check_instructor_conflicts_matrix(df):
+    """
+    Check instructor conflicts by sweeping each instructor's meetings per day.
+    Two meetings conflict when they overlap in time of day and their
+    date ranges (`Start Date`/`End Date`, if known) overlap too.
+    """
+    mf = meeting_frame(df)
+    mf = mf.assign(room=mf['Room'].astype(str).str.strip())
+    return conflict_groups(mf, 'Instructor Name', {'course': 'course', 'room': 'room'})
+
+
 def check_room_conflicts_matrix(df):
     """
-    Check room conflicts using time-day matrix approach.
+    Check room conflicts the same way, per room instead of per instructor.
     """
-    # Filter out online courses and missing room data
-    data = df[df['Meeting Days'].notna() & df['Beginning Time'].notna() & df['Room'].notna()]
-    
-    conflicts = []
-    
-    # Group by room
-    for room, group in data.groupby('Room'):
-        # Create time-day matrix
-        matrix = defaultdict(lambda: {'M': 0, 'T': 0, 'W': 0, 'R': 0, 'F': 0})
-        course_details = defaultdict(lambda: defaultdict(list))
-        
-        for _, row in group.iterrows():
-            start_time = row['Beginning Time']
-            meeting_days = row['Meeting Days']
-            course_info = {
-                'course': f"{row['Subject']}{row['Number']}-{row['Section']}",
-                'instructor': row['Instructor Name']
-            }
-            
-            # Parse meeting days
-            for char in meeting_days:
-                if char in ['M', 'T', 'W', 'R', 'F']:
-                    matrix[start_time][char] += 1
-                    course_details[start_time][char].append(course_info)
-        
-        # Check for conflicts
-        for time_slot, day_counts in matrix.items():
-            for day, count in day_counts.items():
-                if count > 1:
-                    courses = course_details[time_slot][day]
-                    conflicts.append({
-                        'room': room,
-                        'time_slot': time_slot,
-                        'day': day,
-                        'count': count,
-                        'courses': courses
-                    })
-    
-    return conflicts
+    return conflict_groups(meeting_frame(df), 'Room', {'course': 'course', 'instructor': 'Instructor Name'})
 
 
 def md_instructor_matrix_conflicts(conflicts):
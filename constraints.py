@@ -0,0 +1,184 @@
+"""
+Declarative schedule constraints, checked in one pass over the schedule.
+
+A rule is a plain dict with a `rule` kind and its parameters, e.g.
+
+    RULES = [
+        {'rule': 'max_credits', 'limit': 12},
+        {'rule': 'max_credits', 'limit': 6, 'instructors': ['Adjunct A', 'Adjunct B'], 'name': 'adjunct cap'},
+        {'rule': 'max_daily_hours', 'limit': 6},
+        {'rule': 'building_gap', 'minutes': 15},
+        {'rule': 'room_type', 'courses': r'^CHEM \\d+1$', 'rooms': r'^ROTHWELL'},
+        {'rule': 'reserved_room', 'rooms': r'^CORLEY 101$', 'courses': r'^MATH 1'},
+    ]
+
+The aggregates the rules need (credits per instructor, minutes per
+instructor per day, consecutive meetings, ...) are built once per schedule
+and shared, so adding rules only adds cheap vectorized comparisons.
+"""
+from functools import cached_property
+
+import pandas as pd
+
+from conflicts import meeting_frame
+from normalize import keys_of
+from summaries import summarize
+
+
+VIOLATION_COLUMNS = ['rule', 'instructor', 'room', 'course', 'day', 'value', 'limit', 'detail']
+
+DEFAULT_RULES = []
+
+
+def building_of(room):
+    return room.str.rsplit(' ', n=1).str[0]
+
+
+class ScheduleFacts:
+    """Aggregates shared by all rules, each computed at most once."""
+
+    def __init__(self, df):
+        self.df = df
+
+    @cached_property
+    def rooms(self):
+        """Every (section, room) pair in use, from all meeting rows of a section."""
+        rf = self.df[self.df['Room'].notna()]
+        rf = rf.assign(Key=keys_of(rf), Course=rf['Subject'].astype(str) + ' ' + rf['Number'].astype(str))
+        return rf.drop_duplicates(['Key', 'Room'])
+
+    @cached_property
+    def meetings(self):
+        mf = meeting_frame(self.df)
+        return mf.assign(
+            minutes=mf['end'] - mf['start'],
+            building=building_of(mf['Room'].astype('string')),
+        )
+
+    @cached_property
+    def credits(self):
+        return summarize(self.df).instructors['credits']
+
+    @cached_property
+    def daily_minutes(self):
+        return self.meetings.groupby(['Instructor Name', 'day'])['minutes'].sum()
+
+    @cached_property
+    def consecutive(self):
+        """Each instructor meeting next to the one before it on the same day."""
+        mf = self.meetings.sort_values(['Instructor Name', 'day', 'start'])
+        prev = mf.groupby(['Instructor Name', 'day'])[['end', 'building', 'Room']].shift()
+        return mf.assign(
+            gap=mf['start'] - prev['end'],
+            prev_building=prev['building'],
+            prev_room=prev['Room'],
+        ).dropna(subset=['gap'])
+
+
+def violations(rule, **columns):
+    return pd.DataFrame({'rule': rule.get('name', rule['rule']), **columns})
+
+
+def check_max_credits(facts, rule):
+    credits = facts.credits
+    if 'instructors' in rule:
+        credits = credits[credits.index.isin(rule['instructors'])]
+    over = credits[credits > rule['limit']]
+    return violations(
+        rule, instructor=over.index, value=over.values, limit=rule['limit'],
+        detail=[f'{v} credits' for v in over.values],
+    )
+
+
+def check_max_daily_hours(facts, rule):
+    hours = facts.daily_minutes / 60
+    over = hours[hours > rule['limit']]
+    return violations(
+        rule,
+        instructor=over.index.get_level_values(0),
+        day=over.index.get_level_values(1),
+        value=over.values.round(2),
+        limit=rule['limit'],
+        detail=[f'{v:.2f} hours' for v in over.values],
+    )
+
+
+def check_building_gap(facts, rule):
+    cf = facts.consecutive
+    bad = cf[
+        cf['building'].notna() & cf['prev_building'].notna() &
+        (cf['building'] != cf['prev_building']) &
+        (cf['gap'] >= 0) & (cf['gap'] < rule['minutes'])
+    ]
+    return violations(
+        rule,
+        instructor=bad['Instructor Name'].values,
+        room=bad['Room'].values,
+        course=(bad['Subject'].astype(str) + ' ' + bad['Number'].astype(str) + '-' + bad['Section'].astype(str)).values,
+        day=bad['day'].values,
+        value=bad['gap'].values,
+        limit=rule['minutes'],
+        detail=(bad['gap'].astype(int).astype(str) + ' min after ' + bad['prev_room'].astype(str)).values,
+    )
+
+
+def room_rule(facts, rule, reserved):
+    sf = facts.rooms
+    course_ok = sf['Course'].str.match(rule['courses'])
+    room_ok = sf['Room'].astype(str).str.match(rule['rooms'])
+    bad = sf[course_ok & ~room_ok] if not reserved else sf[room_ok & ~course_ok]
+    return violations(
+        rule,
+        instructor=bad['Instructor Name'].values,
+        room=bad['Room'].values,
+        course=(bad['Course'] + '-' + bad['Section'].astype(str)).values,
+        detail=f"courses {rule['courses']} / rooms {rule['rooms']}",
+    )
+
+
+def check_room_type(facts, rule):
+    """Courses matching `courses` must meet in rooms matching `rooms`."""
+    return room_rule(facts, rule, reserved=False)
+
+
+def check_reserved_room(facts, rule):
+    """Rooms matching `rooms` may only host courses matching `courses`."""
+    return room_rule(facts, rule, reserved=True)
+
+
+CHECKS = {
+    'max_credits': check_max_credits,
+    'max_daily_hours': check_max_daily_hours,
+    'building_gap': check_building_gap,
+    'room_type': check_room_type,
+    'reserved_room': check_reserved_room,
+}
+
+
+def check_constraints(df, rules=None):
+    """Evaluate all `rules` against `df` and return one DataFrame of violations."""
+    if rules is None:
+        rules = DEFAULT_RULES
+    for rule in rules:
+        if rule.get('rule') not in CHECKS:
+            raise ValueError(f"Unknown rule: {rule.get('rule')}")
+    facts = ScheduleFacts(df)
+    frames = [CHECKS[rule['rule']](facts, rule) for rule in rules]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS)
+    return pd.concat(frames, ignore_index=True).reindex(columns=VIOLATION_COLUMNS)
+
+
+def md_constraint_violations(violations):
+    if violations.empty:
+        return "# ✅ \n No constraint violations detected!\n"
+
+    t = "# ⚠️ \n CONSTRAINT VIOLATIONS\n"
+    t += "-" * 60
+    t += "\n"
+    t += "| Rule | Instructor | Room | Course | Day | Detail |\n"
+    t += "|------|------------|------|--------|-----|--------|\n"
+    for row in violations.fillna('').itertuples(index=False):
+        t += f"| {row.rule} | {row.instructor} | {row.room} | {row.course} | {row.day} | {row.detail} |\n"
+    return t
@@ -0,0 +1,276 @@
+import hashlib
+import pandas as pd
+import openpyxl
+from openpyxl.styles import Alignment, Border, Side, PatternFill
+from openpyxl.utils import get_column_letter
+from datetime import datetime
+
+
+daymapping = {
+    "B2": "Monday",
+    "C2": "Tuesday",
+    "D2": "Wednesday",
+    "E2": "Thursday",
+    "F2": "Friday",
+}
+
+reversedaymapping = {"M": "B", "T": "C", "W": "D", "R": "E", "F": "F"}
+
+timemapping = {
+    800: '8:00-8:30',
+    830: '8:30-9:00',
+    900: '9:00-9:30',
+    930: '9:30-10:00',
+    1000: '10:00-10:30',
+    1030: '10:30-11:00',
+    1100: '11:00-11:30',
+    1130: '11:30-12:00',
+    1200: '12:00-12:30',
+    1230: '12:30-13:00',
+    1300: '13:00-13:30',
+    1330: '13:30-14:00',
+    1400: '14:00-14:30',
+    1430: '14:30-15:00',
+    1500: '15:00-15:30',
+    1530: '15:30-16:00',
+    1600: '16:00-16:30',
+    1630: '16:30-17:00',
+}
+
+timemapping = {datetime.strptime(str(k).zfill(4), '%H%M').time(): v for k, v in timemapping.items()}
+
+
+BORDER = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin")
+)
+
+COLORS = [
+    "E6F3FF",  # Light blue
+    "E6FFE6",  # Light green
+    "FFF2E6",  # Light orange
+    "F0E6FF",  # Light purple
+    "FFE6F2",  # Light pink
+    "E6FFFF",  # Light cyan
+    "FFFACD",  # Light yellow
+    "F5F5DC",  # Light beige
+    "E6E6FA",  # Light lavender
+    "F0F8E6",  # Light mint
+]
+
+
+def time2idx(t):
+    minutes_since_8 = (t.hour - 8) * 60 + t.minute
+    return minutes_since_8 // 30
+
+
+def generate_table(st):
+    for k, v in daymapping.items():
+        st[k] = v
+        st[k].alignment = Alignment(horizontal="center",
+                                    vertical="center")
+        st.column_dimensions[k[0]].width = 15
+    for k, v in timemapping.items():
+        idx = time2idx(k)
+        st[f"A{idx + 3}"] = v
+        st[f"A{idx + 3}"].alignment = Alignment(horizontal="center",
+                                                vertical="center")
+        st.column_dimensions["A"].width = 15
+    st.merge_cells('A21:A22')
+    st['A21'].alignment = Alignment(wrap_text=True,
+                                    horizontal="center",
+                                    vertical="center")
+    st['A21'] = 'Online'
+    return st
+
+
+def add_a_course_to_a_cell(st, cells, text, color=0, border=BORDER, colors=COLORS):
+    st.merge_cells(cells)
+    firstcell = cells.split(":")[0]
+    st[firstcell] = text
+    st[firstcell].alignment = Alignment(wrap_text=True,
+                                        horizontal="center",
+                                        vertical="center")
+    st[firstcell].border = border
+    for row in st[cells]:
+        for cell in row:
+            cell.border = border
+    colname = firstcell[0]
+    firstrow = int(firstcell[1:])
+    lastrow = int(cells.split(":")[1][1:])
+    st.column_dimensions[colname].width = 15
+    for i in range(firstrow, lastrow + 1):
+        st.row_dimensions[i].height = 30
+    st[firstcell].fill = PatternFill(start_color=colors[color], end_color=colors[color], fill_type="solid")
+    return st
+
+
+def add_a_row(st, row, color=0):
+    instructor_text = f"{row['Subject']} {row['Number']} {row['Section']} {row['Room']}"
+    if not pd.isna(row["Meeting Days"]):
+        for day in row["Meeting Days"]:
+            col = reversedaymapping[day]
+            r1 = time2idx(row["Beginning Time"])
+            r2 = time2idx(row["Ending Time"])
+            cells = f"{col}{r1 + 3}:{col}{r2 + 3}"
+            add_a_course_to_a_cell(st, cells, instructor_text, color)
+    else:
+        rnum = 21
+        cnum = 2
+        found = False
+        while not found:
+            c_cell = st.cell(row=rnum, column=cnum).value
+            if c_cell is not None:
+                cnum += 1
+            else:
+                found = True
+
+        st.merge_cells(f"{get_column_letter(cnum)}{rnum}:{get_column_letter(cnum)}{rnum+1}")
+        f_r = f"{get_column_letter(cnum)}{rnum}"
+
+        st[f_r] = instructor_text
+        st[f_r].alignment = Alignment(wrap_text=True,
+                                      horizontal="center",
+                                      vertical="center")
+        st[f_r].fill = PatternFill(start_color=COLORS[color],
+                                   end_color=COLORS[color],
+                                   fill_type="solid")
+        for i in range(rnum, rnum + 2):
+            st.row_dimensions[i].height = 30
+            st[f"{get_column_letter(cnum)}{i}"].border = BORDER
+
+    return st
+
+
+def add_same_instructors(st, df, name):
+    if not pd.isna(name):
+        sf = df[df["Instructor Name"] == name] 
+    else:
+        sf = df[df["Instructor Name"].isna()]
+    color_idx = {
+        f"{r['Number']} {r['Section']}": i
+        for i, r in sf[["Subject", "Number", "Section"]].drop_duplicates().reset_index().iterrows()
+    }
+    for i, row in sf.iterrows():
+        add_a_row(st, row, color_idx[f"{row['Number']} {row['Section']}"])
+    return st
+
+
+def add_a_row_room(st, row, color=0):
+    instructor_text = f"{row['Subject']} {row['Number']} {row['Section']} {row['Instructor Name']}"
+    for day in row["Meeting Days"]:
+        col = reversedaymapping[day]
+        r1 = time2idx(row["Beginning Time"])
+        r2 = time2idx(row["Ending Time"])
+        cells = f"{col}{r1 + 3}:{col}{r2 + 3}"
+        add_a_course_to_a_cell(st, cells, instructor_text, color)
+    return st
+
+
+def add_same_room(st, df, room):
+    sf = df
+    sf = sf[sf["Room"] == room]
+    color_idx = {
+        f"{r['Number']} {r['Section']}": i
+        for i, r in sf[["Subject", "Number", "Section"]].drop_duplicates().reset_index().iterrows()
+    }
+    for i, row in sf.iterrows():
+        add_a_row_room(st, row, color_idx[f"{row['Number']} {row['Section']}"])
+    return st
+
+
+def room_excel(wb, df):
+    rooms = df[["Room"]].drop_duplicates().dropna()
+    for i, r in rooms.iterrows():
+        st = wb.create_sheet(f"{r['Room']}")
+        generate_table(st)
+        # print(r['Room'])
+        add_same_room(st, df, r["Room"])
+
+
+def instructor_excel(wb, df):
+    names = df["Instructor Name"].drop_duplicates()
+    for name in names:
+        st = wb.create_sheet(f'{name}')
+        generate_table(st)
+        # print(name)
+        add_same_instructors(st, df, name)
+
+
+SHEET_KINDS = {
+    'room': ('Room', add_same_room),
+    'instructor': ('Instructor Name', add_same_instructors),
+}
+
+SHEET_COLUMNS = ['Subject', 'Number', 'Section', 'Instructor Name', 'Meeting Days',
+                 'Beginning Time', 'Ending Time', 'Room']
+
+
+def sheet_fingerprints(df, column):
+    """Map each sheet key to a hash of the rows it shows, in order."""
+    hashes = pd.util.hash_pandas_object(df[SHEET_COLUMNS], index=False)
+    keys = df[column]
+    if column == 'Room':
+        hashes, keys = hashes[keys.notna()], keys[keys.notna()]
+    fingerprints = {}
+    for key, h in hashes.groupby(keys, sort=False, dropna=False):
+        fingerprints[key] = hashlib.sha1(h.to_numpy().tobytes()).hexdigest()
+    return fingerprints
+
+
+class SheetCache:
+    """
+    Keeps a rendered room or instructor workbook between calls.
+    Each sheet is fingerprinted from the sections it shows; on update only
+    sheets whose fingerprint changed are rebuilt, the rest are reused.
+    The caller owns the cache (see sheet_caches()) and drops it with the
+    workbook when it is done regenerating that schedule.
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.wb = None
+        self.fingerprints = {}
+
+    def update(self, df):
+        column, fill = SHEET_KINDS[self.kind]
+        fingerprints = sheet_fingerprints(df, column)
+        if self.wb is None:
+            self.wb = openpyxl.Workbook()
+            self.wb.remove(self.wb.active)
+            self.fingerprints = {}
+
+        titles = {f'{key}': key for key in fingerprints}
+        for title in list(self.fingerprints):
+            if title not in titles:
+                self.wb.remove(self.wb[title])
+                del self.fingerprints[title]
+
+        changed = []
+        for title, key in titles.items():
+            if self.fingerprints.get(title) == fingerprints[key]:
+                continue
+            if title in self.fingerprints:
+                self.wb.remove(self.wb[title])
+            st = self.wb.create_sheet(title)
+            generate_table(st)
+            fill(st, df, key)
+            self.fingerprints[title] = fingerprints[key]
+            changed.append(title)
+
+        for pos, title in enumerate(titles):
+            offset = pos - self.wb.sheetnames.index(title)
+            if offset:
+                self.wb.move_sheet(title, offset)
+        return changed
+
+    def save(self, df, filename):
+        self.update(df)
+        self.wb.save(filename)
+
+
+def sheet_caches():
+    """A fresh room and instructor SheetCache, e.g. for save_reports(..., caches=...)."""
+    return {kind: SheetCache(kind) for kind in SHEET_KINDS}
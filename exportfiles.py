@@ -0,0 +1,95 @@
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import find_spec
+from pathlib import Path
+
+
+MIME_TYPES = {
+    'xlsx': "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    'csv': "text/csv",
+    'parquet': "application/vnd.apache.parquet",
+    'zip': "application/zip",
+}
+
+# Below this many rows in total, starting worker processes costs more
+# than rendering the tables one after another.
+PROCESS_MIN_ROWS = 20000
+
+
+def excel_engine():
+    """Pick the fastest installed xlsx writer, falling back to openpyxl."""
+    if find_spec('xlsxwriter') is not None:
+        return 'xlsxwriter'
+    return 'openpyxl'
+
+
+def export_formats():
+    """Formats that can be written here; parquet needs pyarrow or fastparquet."""
+    formats = ['xlsx', 'csv']
+    if find_spec('pyarrow') is not None or find_spec('fastparquet') is not None:
+        formats.append('parquet')
+    return formats
+
+
+def table_to_bytes(df, fmt='xlsx'):
+    buffer = io.BytesIO()
+    if fmt == 'xlsx':
+        df.to_excel(buffer, index=False, engine=excel_engine())
+    elif fmt == 'csv':
+        buffer.write(df.to_csv(index=False).encode('utf-8'))
+    elif fmt == 'parquet':
+        # Times are stored as datetime.time objects, which parquet handles
+        # natively; everything else left as object is written as text.
+        sf = df.copy()
+        for c in sf.columns:
+            if sf[c].dtype != object:
+                continue
+            if c in ('Beginning Time', 'Ending Time'):
+                sf[c] = sf[c].where(sf[c].notna(), None)
+            else:
+                sf[c] = sf[c].astype('string')
+        sf.to_parquet(buffer, index=False)
+    else:
+        raise ValueError(f'Unknown export format: {fmt}')
+    return buffer.getvalue()
+
+
+def render_tables(tables, formats=('xlsx',), max_workers=None):
+    """
+    Render every table in every format, in worker processes when it pays.
+    The xlsx writers are pure Python and hold the GIL, so threads do not
+    help; large exports go to a process pool instead.
+    `tables` maps a base file name to a DataFrame.
+    Returns a dict mapping file names (with extension) to bytes.
+    """
+    jobs = [(f'{name}.{fmt}', df, fmt) for name, df in tables.items() for fmt in formats]
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    rows = sum(len(df) for _, df, _ in jobs)
+    if workers < 2 or rows < PROCESS_MIN_ROWS:
+        return {fname: table_to_bytes(df, fmt) for fname, df, fmt in jobs}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {fname: pool.submit(table_to_bytes, df, fmt) for fname, df, fmt in jobs}
+    return {fname: f.result() for fname, f in futures.items()}
+
+
+def write_tables(tables, folder="out", formats=('xlsx',), max_workers=None):
+    Path(folder).mkdir(parents=True, exist_ok=True)
+    files = render_tables(tables, formats, max_workers)
+    for fname, data in files.items():
+        (Path(folder) / fname).write_bytes(data)
+    return list(files)
+
+
+def zip_tables(tables, formats=('xlsx',), max_workers=None, extra_files=None):
+    """Bundle all rendered tables (and any `extra_files` bytes) into one in-memory zip."""
+    files = render_tables(tables, formats, max_workers)
+    if extra_files:
+        files.update(extra_files)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for fname, data in files.items():
+            zf.writestr(fname, data)
+    buffer.seek(0)
+    return buffer
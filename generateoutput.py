@@ -1,12 +1,11 @@
 import pandas as pd
 from pathlib import Path
-import openpyxl
-from openpyxl.styles import Alignment, Border, Side, PatternFill
-from openpyxl.utils import get_column_letter
-from datetime import datetime
-from IPython.display import Markdown, display
 
 
+from exportfiles import write_tables
+from summaries import summarize, summary_tables
+from normalize import without_key
+from constraints import check_constraints, md_constraint_violations, DEFAULT_RULES
 from conflicts import (
     check_instructor_conflicts_matrix,
     md_instructor_matrix_conflicts,
@@ -14,197 +13,54 @@ from conflicts import (
     md_room_matrix_conflicts,
 )
 
-daymapping = {
-    "B2": "Monday",
-    "C2": "Tuesday",
-    "D2": "Wednesday",
-    "E2": "Thursday",
-    "F2": "Friday",
-}
+# The openpyxl sheet builders live in excelsheets.py and are only imported
+# when one of them is used, so report and conflict runs don't pay for openpyxl.
+EXCEL_NAMES = {'room_excel', 'instructor_excel', 'SheetCache', 'sheet_caches'}
 
-reversedaymapping = {"M": "B", "T": "C", "W": "D", "R": "E", "F": "F"}
-
-timemapping = {
-    800: '8:00-8:30',
-    830: '8:30-9:00',
-    900: '9:00-9:30',
-    930: '9:30-10:00',
-    1000: '10:00-10:30',
-    1030: '10:30-11:00',
-    1100: '11:00-11:30',
-    1130: '11:30-12:00',
-    1200: '12:00-12:30',
-    1230: '12:30-13:00',
-    1300: '13:00-13:30',
-    1330: '13:30-14:00',
-    1400: '14:00-14:30',
-    1430: '14:30-15:00',
-    1500: '15:00-15:30',
-    1530: '15:30-16:00',
-    1600: '16:00-16:30',
-    1630: '16:30-17:00',
-}
 
-timemapping = {datetime.strptime(str(k).zfill(4), '%H%M').time(): v for k, v in timemapping.items()}
+def __getattr__(name):
+    if name in EXCEL_NAMES:
+        import excelsheets
+        return getattr(excelsheets, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-BORDER = Border(
-    left=Side(style="thin"),
-    right=Side(style="thin"),
-    top=Side(style="thin"),
-    bottom=Side(style="thin")
-)
+REPORT_COLUMNS = {
+    'Instructors': (['Instructor', 'Course', 'Section', 'Days', 'Time', 'Room'], ['Instructor Name']),
+    'Rooms': (['Room', 'Days', 'Time', 'Course', 'Section', 'Instructor'], ['Room']),
+    'Courses': (['Course', 'Section', 'Instructor', 'Days', 'Time', 'Room'], ['Subject', 'Number']),
+    'Time slots': (['Days', 'Time', 'Course', 'Section', 'Instructor', 'Room'], ['Meeting Days', 'Beginning Time']),
+}
 
-COLORS = [
-    "E6F3FF",  # Light blue
-    "E6FFE6",  # Light green
-    "FFF2E6",  # Light orange
-    "F0E6FF",  # Light purple
-    "FFE6F2",  # Light pink
-    "E6FFFF",  # Light cyan
-    "FFFACD",  # Light yellow
-    "F5F5DC",  # Light beige
-    "E6E6FA",  # Light lavender
-    "F0F8E6",  # Light mint
-]
-
-
-def time2idx(t):
-    minutes_since_8 = (t.hour - 8) * 60 + t.minute
-    return minutes_since_8 // 30
-
-
-def generate_table(st):
-    for k, v in daymapping.items():
-        st[k] = v
-        st[k].alignment = Alignment(horizontal="center",
-                                    vertical="center")
-        st.column_dimensions[k[0]].width = 15
-    for k, v in timemapping.items():
-        idx = time2idx(k)
-        st[f"A{idx + 3}"] = v
-        st[f"A{idx + 3}"].alignment = Alignment(horizontal="center",
-                                                vertical="center")
-        st.column_dimensions["A"].width = 15
-    st.merge_cells('A21:A22')
-    st['A21'].alignment = Alignment(wrap_text=True,
-                                    horizontal="center",
-                                    vertical="center")
-    st['A21'] = 'Online'
-    return st
-
-
-def add_a_course_to_a_cell(st, cells, text, color=0, border=BORDER, colors=COLORS):
-    st.merge_cells(cells)
-    firstcell = cells.split(":")[0]
-    st[firstcell] = text
-    st[firstcell].alignment = Alignment(wrap_text=True,
-                                        horizontal="center",
-                                        vertical="center")
-    st[firstcell].border = border
-    for row in st[cells]:
-        for cell in row:
-            cell.border = border
-    colname = firstcell[0]
-    firstrow = int(firstcell[1:])
-    lastrow = int(cells.split(":")[1][1:])
-    st.column_dimensions[colname].width = 15
-    for i in range(firstrow, lastrow + 1):
-        st.row_dimensions[i].height = 30
-    st[firstcell].fill = PatternFill(start_color=colors[color], end_color=colors[color], fill_type="solid")
-    return st
-
-
-def add_a_row(st, row, color=0):
-    instructor_text = f"{row['Subject']} {row['Number']} {row['Section']} {row['Room']}"
-    if not pd.isna(row["Meeting Days"]):
-        for day in row["Meeting Days"]:
-            col = reversedaymapping[day]
-            r1 = time2idx(row["Beginning Time"])
-            r2 = time2idx(row["Ending Time"])
-            cells = f"{col}{r1 + 3}:{col}{r2 + 3}"
-            add_a_course_to_a_cell(st, cells, instructor_text, color)
-    else:
-        rnum = 21
-        cnum = 2
-        found = False
-        while not found:
-            c_cell = st.cell(row=rnum, column=cnum).value
-            if c_cell is not None:
-                cnum += 1
-            else:
-                found = True
-
-        st.merge_cells(f"{get_column_letter(cnum)}{rnum}:{get_column_letter(cnum)}{rnum+1}")
-        f_r = f"{get_column_letter(cnum)}{rnum}"
-
-        st[f_r] = instructor_text
-        st[f_r].alignment = Alignment(wrap_text=True,
-                                      horizontal="center",
-                                      vertical="center")
-        st[f_r].fill = PatternFill(start_color=COLORS[color],
-                                   end_color=COLORS[color],
-                                   fill_type="solid")
-        for i in range(rnum, rnum + 2):
-            st.row_dimensions[i].height = 30
-            st[f"{get_column_letter(cnum)}{i}"].border = BORDER
-
-    return st
-
-
-def add_same_instructors(st, df, name):
-    if not pd.isna(name):
-        sf = df[df["Instructor Name"] == name] 
-    else:
-        sf = df[df["Instructor Name"].isna()]
-    color_idx = {
-        f"{r['Number']} {r['Section']}": i
-        for i, r in sf[["Subject", "Number", "Section"]].drop_duplicates().reset_index().iterrows()
-    }
-    for i, row in sf.iterrows():
-        add_a_row(st, row, color_idx[f"{row['Number']} {row['Section']}"])
-    return st
-
-
-def add_a_row_room(st, row, color=0):
-    instructor_text = f"{row['Subject']} {row['Number']} {row['Section']} {row['Instructor Name']}"
-    for day in row["Meeting Days"]:
-        col = reversedaymapping[day]
-        r1 = time2idx(row["Beginning Time"])
-        r2 = time2idx(row["Ending Time"])
-        cells = f"{col}{r1 + 3}:{col}{r2 + 3}"
-        add_a_course_to_a_cell(st, cells, instructor_text, color)
-    return st
-
-
-def add_same_room(st, df, room):
-    sf = df
-    sf = sf[sf["Room"] == room]
-    color_idx = {
-        f"{r['Number']} {r['Section']}": i
-        for i, r in sf[["Subject", "Number", "Section"]].drop_duplicates().reset_index().iterrows()
-    }
-    for i, row in sf.iterrows():
-        add_a_row_room(st, row, color_idx[f"{row['Number']} {row['Section']}"])
-    return st
 
+def report_view(df):
+    """One display-ready row per section, shared by all report tables."""
+    view = pd.DataFrame({
+        'Instructor': df['Instructor Name'],
+        'Course': df['Subject'].astype(str) + ' ' + df['Number'].astype(str),
+        'Section': df['Section'],
+        'Days': df['Meeting Days'].fillna('Online'),
+        'Time': df['Beginning Time'].map(lambda x: '' if pd.isna(x) else str(x)),
+        'Room': df['Room'].fillna('Online').astype(str),
+    }, index=df.index)
+    return view
 
-def room_excel(wb, df):
-    rooms = df[["Room"]].drop_duplicates().dropna()
-    for i, r in rooms.iterrows():
-        st = wb.create_sheet(f"{r['Room']}")
-        generate_table(st)
-        # print(r['Room'])
-        add_same_room(st, df, r["Room"])
 
+def report_table(df, name, view=None):
+    """
+    Structured counterpart of the md_* reports: the rows of the `name` report,
+    grouped (sorted) the same way and with rows the Markdown would skip dropped.
+    """
+    if view is None:
+        view = report_view(df)
+    columns, keys = REPORT_COLUMNS[name]
+    sf = df.dropna(subset=keys).sort_values(keys, kind='stable')
+    return view.loc[sf.index, columns].reset_index(drop=True)
 
-def instructor_excel(wb, df):
-    names = df["Instructor Name"].drop_duplicates()
-    for name in names:
-        st = wb.create_sheet(f'{name}')
-        generate_table(st)
-        # print(name)
-        add_same_instructors(st, df, name)
+
+def report_tables(df):
+    view = report_view(df)
+    return {name: report_table(df, name, view) for name in REPORT_COLUMNS}
 
 
 def md_instructor(df):
@@ -275,12 +131,7 @@ def md_rooms(df):
 
 
 def md_compute_credits(df):
-    credit_clean = (
-        df[["Instructor Name", "Subject", "Number", "Section", "Credits"]]
-        .drop_duplicates()
-        .reset_index(drop=True)
-    )
-    d = credit_clean[["Credits"]].groupby([credit_clean["Instructor Name"]]).sum().to_dict()['Credits']
+    d = summarize(df).instructors['credits'].to_dict()
 
     t = "| Instructor | Credits |\n"
     t += "|---------|------------|\n"
@@ -304,6 +155,9 @@ def write_into_argos(df):
 
 def write_into_ad(df):
     sf = df[['Instructor Name', 'Meeting Days', 'Beginning Time', 'Ending Time', 'Room']].copy()
+    for c in ('Start Date', 'End Date'):
+        if c in df.columns:
+            sf[c] = df[c]
     sf['Course/Section'] = (
         df['Subject'].fillna('').astype(str) + " " +
         df['Number'].fillna('').astype(str) + "/" +
@@ -325,11 +179,23 @@ def write_into_ad(df):
     return sf
 
 
-def generate_reports(df):
+def schedule_tables(df):
+    return {
+        'schedule_argos': write_into_argos(df),
+        'schedule_ad': write_into_ad(df),
+        'schedule': without_key(df),
+        **summary_tables(df),
+    }
+
+
+def generate_reports(df, rules=None):
     instructor_conflicts = check_instructor_conflicts_matrix(df)
     ic = md_instructor_matrix_conflicts(instructor_conflicts)
     room_conflicts = check_room_conflicts_matrix(df)
     rc = md_room_matrix_conflicts(room_conflicts)
+    violations = check_constraints(df, rules)
+    # Without any rules there is nothing to report, not "no violations".
+    v = md_constraint_violations(violations) if (rules or DEFAULT_RULES) else ''
     t = md_time(df)
     n = md_instructor(df)
     c = md_courses(df)
@@ -340,6 +206,8 @@ def generate_reports(df):
         'room_conflicts': room_conflicts,
         'instructor_conflicts_text': ic,
         'room_conflicts_text': rc,
+        'constraint_violations': violations,
+        'constraint_violations_text': v,
         'schedule_time': t,
         'schedule_instructor': n,
         'schedule_course': c,
@@ -348,10 +216,15 @@ def generate_reports(df):
     }
 
 
-def save_reports(df, folder="out"):
+def save_reports(df, folder="out", formats=('xlsx',), rules=None, caches=None):
+    """
+    Write the reports and tables of `df` into `folder`.
+    To regenerate the same schedule repeatedly, pass the same
+    `caches = sheet_caches()` each time so only changed sheets are rebuilt.
+    """
     Path(folder).mkdir(parents=True, exist_ok=True)
 
-    reports = generate_reports(df)
+    reports = generate_reports(df, rules)
 
     instructor_conflicts = reports['instructor_conflicts']
     ic = reports['instructor_conflicts_text']
@@ -374,20 +247,20 @@ def save_reports(df, folder="out"):
 
     print(ic)
     print(rc)
-    display(Markdown(h))
+    if reports['constraint_violations_text']:
+        print(reports['constraint_violations_text'])
+    try:
+        from IPython.display import Markdown, display
+        display(Markdown(h))
+    except ImportError:
+        print(h)
 
 
     if (not instructor_conflicts) and (not room_conflicts):
-        wbr = openpyxl.Workbook()
-        wbr.remove(wbr.active)
-        room_excel(wbr, df)
-        wbr.save(Path(folder) / "schedule_room.xlsx")
-
-        wbu = openpyxl.Workbook()
-        wbu.remove(wbu.active)
-        instructor_excel(wbu, df)
-        wbu.save(Path(folder) / "schedule_instructor.xlsx")
-
-    write_into_argos(df).to_excel(Path(folder) / "schedule_argos.xlsx", index=False)
-    write_into_ad(df).to_excel(Path(folder) / "schedule_ad.xlsx", index=False)
-    df.to_excel(Path(folder) / "schedule.xlsx", index=False)
+        if caches is None:
+            from excelsheets import sheet_caches
+            caches = sheet_caches()
+        caches['room'].save(df, Path(folder) / "schedule_room.xlsx")
+        caches['instructor'].save(df, Path(folder) / "schedule_instructor.xlsx")
+
+    write_tables(schedule_tables(df), folder, formats)
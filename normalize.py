@@ -0,0 +1,91 @@
+"""
+Vectorized normalization of schedule keys, rooms, times and credits.
+
+The readers run these once at ingestion; the editing helpers, conflict
+checks and summaries reuse the canonical `Key` column they add instead of
+re-deriving it from Subject/Number/Section on every call.
+"""
+import numpy as np
+import pandas as pd
+
+
+TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p", "%H%M", "%H%M.0")
+
+
+def text(s):
+    return s.astype(str).str.strip()
+
+
+def course_key(subject, number, section):
+    """Canonical section key, e.g. 'MATH1003-001' (same form as the conflict reports)."""
+    return subject.astype(str).str.strip() + text(number) + '-' + text(section)
+
+
+def keys_of(df):
+    """The `Key` column, derived from Subject/Number/Section where it is missing."""
+    if 'Key' not in df.columns:
+        return course_key(df['Subject'], df['Number'], df['Section'])
+    key = df['Key']
+    missing = key.isna()
+    if missing.any():
+        sf = df[missing]
+        key = key.copy()
+        key[missing] = course_key(sf['Subject'], sf['Number'], sf['Section'])
+    return key
+
+
+def without_key(df):
+    """`df` as exported and displayed: the internal `Key` column left out."""
+    return df.drop(columns=['Key'], errors='ignore')
+
+
+def key_parts(subject, cnumber, section):
+    """Subject, number and section of one section as the text stored in a schedule."""
+    return str(subject).strip(), str(cnumber).strip(), str(section).strip()
+
+
+def key_of(subject, cnumber, section):
+    return '{}{}-{}'.format(*key_parts(subject, cnumber, section))
+
+
+def key_mask(df, subject, cnumber, section, days=None):
+    """Rows of one section (optionally only its `days` meeting) as a boolean mask."""
+    mask = keys_of(df) == key_of(subject, cnumber, section)
+    if days is not None:
+        mask &= df['Meeting Days'] == days
+    return mask
+
+
+def room_number(room):
+    """Room numbers as text, with whole floats from Excel (101.0) written as 101."""
+    numeric = pd.to_numeric(room, errors='coerce')
+    whole = numeric.notna() & (numeric % 1 == 0)
+    out = room.astype(str)
+    out[whole] = numeric[whole].astype(np.int64).astype(str)
+    return out
+
+
+def merge_building_room(building, room):
+    """'Building Room' strings, NaN where there is no building."""
+    merged = building.astype(str).str.strip() + ' ' + room_number(room)
+    return merged.where(building.notna(), np.nan)
+
+
+def credits_from_number(number):
+    """Credit hours from the last digit of the course number."""
+    return text(number).str[-1].astype(int)
+
+
+def parse_times(s):
+    """Vectorized parse_time: each format is tried over the whole column in turn."""
+    raw = s.astype(str).str.strip().str.zfill(4)
+    parsed = pd.Series(pd.NaT, index=s.index, dtype='datetime64[ns]')
+    for fmt in TIME_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(raw[missing], format=fmt, errors='coerce')
+    out = pd.Series(np.nan, index=s.index, dtype=object)
+    found = parsed.notna()
+    out[found] = parsed[found].dt.time
+    return out
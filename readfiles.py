@@ -3,9 +3,15 @@ import numpy as np
 from datetime import datetime, time
 import os
 
+from normalize import TIME_FORMATS, parse_times, merge_building_room, credits_from_number, course_key, text
+
+SECTION_PATTERN = r"^(AT|TC|[0-9]|M|H|F)"
+AD_COURSE = r'(?P<Subject>[A-Z]+) (?P<Number>[\w-]+)/(?P<Section>\w+)'
+
+
 def parse_time(s):
     if not pd.isna(s):
-        for fmt in ("%H:%M", "%H:%M:%S", "%I:%M %p", "%H%M", "%H%M.0"):
+        for fmt in TIME_FORMATS:
             try:
                 return datetime.strptime(s.zfill(4), fmt).time()
             except ValueError:
@@ -27,9 +33,9 @@ def merge_rows(df):
             elif pd.isna(LL[0]) and pd.isna(LL[1]):
                 rf[c] = [LL[0]]
             else:
-                if c == 'Beginning Time':
+                if c in ('Beginning Time', 'Start Date'):
                     rf[c] = min(LL[0], LL[1])
-                elif c == 'Ending Time':
+                elif c in ('Ending Time', 'End Date'):
                     rf[c] = max(LL[0], LL[1])
                 else:
                     rf[c] = [f'{LL[0]}-{LL[1]}']
@@ -47,46 +53,49 @@ def merge_cross_list(df):
     return df.drop(columns=['Cross-List'])
 
 
-def read_from_ad(df):
+def add_dates(sf, df):
+    """Keep part-of-term date ranges when the export has them."""
+    for c in ('Start Date', 'End Date'):
+        if c in df.columns:
+            sf[c] = pd.to_datetime(df[c], errors='coerce')
+    return sf
+
+
+def normalize_ad(df):
     sf = df['Course/Section'].str.extract(r'(?P<Subject>[A-Z]+) (?P<Number>[\w-]+)/(?P<Section>\w+) (?P<Type>\w+)')
     # sf = sf.drop(columns=['Type'])
     sf['Instructor Name'] = df['Instructor']
     sf['Meeting Days'] = df['Days Met'].str.upper()
-    sf['Beginning Time'] = df['Start Time'].apply(parse_time)
-    sf['Ending Time'] = df['End Time'].apply(parse_time)
+    sf['Beginning Time'] = parse_times(df['Start Time'])
+    sf['Ending Time'] = parse_times(df['End Time'])
     sf['Room'] = df['Room']
-    sf['Credits'] = sf['Number'].astype(str).str[-1].astype(int)
+    sf['Credits'] = credits_from_number(sf['Number'])
     sf['Cross-List'] = df['Cross-List']
     if 'Catalog Title' in df.columns:
         sf['Title'] = df['Catalog Title']
     else:
         sf['Title'] = np.nan
-    sf = merge_cross_list(sf)
-    sf = clean_df(sf)
+    add_dates(sf, df)
     return sf
 
 
-def roomnumber(x):
-    return int(x) if str(x).isdigit() else x
-
-def merge_building_room(x):
-    if pd.isna(x['Building']):
-        t = np.nan
-    else:
-        t = f'{x['Building']} {roomnumber(x['Room'])}'
-    return t
+def read_from_ad(df):
+    sf = normalize_ad(df)
+    sf = merge_cross_list(sf)
+    sf = clean_df(sf)
+    return sf
 
 
-def read_from_argos(df):
+def normalize_argos(df):
     sf = df[['Subject', 'Number', 'Section', 'Instructor Name', 'Meeting Days']].copy()
     sf['Number'] = sf['Number'].astype(str)
-    sf['Beginning Time'] = df['Beginning Time'].astype(str).apply(parse_time).copy()
-    sf['Ending Time'] = df['Ending Time'].astype(str).apply(parse_time).copy()
-    sf['Room'] = df[["Building", "Room"]].apply(merge_building_room, axis=1).copy()
+    sf['Beginning Time'] = parse_times(df['Beginning Time'])
+    sf['Ending Time'] = parse_times(df['Ending Time'])
+    sf['Room'] = merge_building_room(df['Building'], df['Room'])
     if 'Course Credit Hours' in df.columns:
         sf['Credits'] = df['Course Credit Hours'].copy().astype(int)
     else:
-        sf['Credits'] = df['Number'].str[-1].astype(int)
+        sf['Credits'] = credits_from_number(df['Number'])
     if 'Cross-List' in df.columns:
         sf['Cross-List'] = df['Cross-List']
     else:
@@ -99,6 +108,12 @@ def read_from_argos(df):
         sf['Title'] = df['Catalog Title'].copy()
     else:
         sf['Title'] = ''
+    add_dates(sf, df)
+    return sf
+
+
+def read_from_argos(df):
+    sf = normalize_argos(df)
     sf = merge_cross_list(sf)
     sf = clean_df(sf)
     return sf
@@ -107,15 +122,16 @@ def read_from_argos(df):
 def clean_df(df):
     df['Instructor Name'] = df['Instructor Name'].str.strip()
     df['Subject'] = df['Subject'].str.strip()
-    df['Number'] = df['Number'].astype(str).str.strip()
-    df['Section'] = df['Section'].astype(str).str.strip()
+    df['Number'] = text(df['Number'])
+    df['Section'] = text(df['Section'])
     df['Meeting Days'] = df['Meeting Days'].str.upper()
     df['Room'] = df['Room'].str.strip()
-    df = df[df['Section'].str.match(r"^(AT|TC|[0-9]|M|H|F)")]
+    df['Key'] = course_key(df['Subject'], df['Number'], df['Section'])
+    df = df[df['Section'].str.match(SECTION_PATTERN)]
     return df
 
 
-def read_from_file(filename):
+def read_from_file(filename, subjects=None, departments=None, section_prefixes=None):
     
     # fileext = os.path.splitext(str(filename))[-1].lstrip('.')
     # print(fileext)
@@ -123,10 +139,18 @@ def read_from_file(filename):
         fileext = filename.split('.')[-1]
     else:
         fileext = filename.name.split('.')[-1]
+    filtered = any(f is not None for f in (subjects, departments, section_prefixes))
+    if fileext == 'csv' and filtered:
+        return read_from_csv_chunks(filename, subjects, departments, section_prefixes)
     if  fileext in ['xlsx', 'xls']:
         df = pd.read_excel(filename)
+        if filtered:
+            return read_from_chunks(lambda usecols: [df if usecols is None else df[usecols]],
+                                    df.columns, subjects, departments, section_prefixes)
     elif fileext == 'csv':
         df = pd.read_csv(filename)
+    else:
+        raise ValueError(f'Unsupported file type: {fileext!r} (expected xlsx, xls or csv)')
 
     df = df.dropna(how='all')
     if 'Course/Section' in df.columns:
@@ -136,6 +160,89 @@ def read_from_file(filename):
     
     return sf
 
+def raw_keys(chunk):
+    """Subject and Section of raw export rows, before any normalization."""
+    if 'Course/Section' in chunk.columns:
+        return chunk['Course/Section'].str.extract(AD_COURSE)
+    return chunk[['Subject', 'Section']]
+
+
+def chunk_mask(sf, subjects=None, section_prefixes=None):
+    section = text(sf['Section'])
+    mask = section.str.match(SECTION_PATTERN)
+    if subjects is not None:
+        mask &= sf['Subject'].str.strip().isin(subjects)
+    if section_prefixes is not None:
+        mask &= section.str.startswith(tuple(section_prefixes))
+    return mask
+
+
+def row_mask(chunk, subjects=None, departments=None, section_prefixes=None,
+             department_column='Department'):
+    """Raw rows of `chunk` selected by the filters."""
+    mask = chunk_mask(raw_keys(chunk), subjects, section_prefixes)
+    if departments is not None:
+        mask &= chunk[department_column].astype(str).str.strip().isin(departments)
+    return mask
+
+
+def read_from_chunks(open_chunks, columns, subjects=None, departments=None, section_prefixes=None,
+                     department_column='Department'):
+    """
+    Read only the raw rows that match the given subjects, departments and
+    section prefixes, plus their cross-listed partners, and normalize them.
+    `open_chunks(usecols)` returns a fresh iterator over the raw chunks
+    (only `usecols` of them when given) and `columns` are the export's columns.
+
+    A first pass over the key columns collects the cross-lists of the
+    matching rows, so the second pass keeps just those partners and memory
+    follows the size of the selection rather than of the whole export.
+    """
+    if departments is not None and department_column not in columns:
+        raise ValueError(f'Cannot filter by department: no {department_column!r} column')
+    keys = ['Course/Section'] if 'Course/Section' in columns else ['Subject', 'Section']
+    if departments is not None:
+        keys.append(department_column)
+    filters = dict(subjects=subjects, departments=departments, section_prefixes=section_prefixes,
+                   department_column=department_column)
+
+    cross_lists = set()
+    if 'Cross-List' in columns:
+        for chunk in open_chunks(keys + ['Cross-List']):
+            cross_lists.update(chunk.loc[row_mask(chunk, **filters), 'Cross-List'].dropna())
+
+    kept = []
+    for chunk in open_chunks(None):
+        chunk = chunk.dropna(how='all')
+        mask = row_mask(chunk, **filters)
+        if 'Cross-List' in chunk.columns:
+            mask |= chunk['Cross-List'].isin(cross_lists)
+        kept.append(chunk[mask])
+
+    df = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame()
+    if df.empty:
+        raise ValueError('No rows match the given filters')
+    if 'Course/Section' in df.columns:
+        return read_from_ad(df)
+    return read_from_argos(df)
+
+
+def read_from_csv_chunks(filename, subjects=None, departments=None, section_prefixes=None,
+                         department_column='Department', chunksize=50000):
+    """
+    Stream a (possibly university-wide) CSV export through read_from_chunks,
+    so peak memory follows the size of the selected rows rather than the
+    size of the whole file.
+    """
+    def open_chunks(usecols=None, **kwargs):
+        if hasattr(filename, 'seek'):
+            filename.seek(0)
+        return pd.read_csv(filename, usecols=usecols, **kwargs)
+
+    columns = open_chunks(nrows=0).columns
+    return read_from_chunks(lambda usecols: open_chunks(usecols, chunksize=chunksize), columns,
+                            subjects, departments, section_prefixes, department_column)
+
 if __name__ == '__main__':
     # df1 = read_from_file('src/MAPS fall 25.xlsx')
     # df2 = read_from_file('src/schedule.xlsx')
@@ -0,0 +1,169 @@
+"""
+Spread in-person sections over the standard time slots to lower peak room demand.
+
+    edits = rebalance(df, movable=df['Meeting Days'].eq('MWF'))
+    df = apply_edits(df, edits)    # from changingsections
+
+Room demand is the number of in-person meetings going on in each 5-minute
+bin of the week. rebalance() moves the chosen sections, one at a time, to
+the standard slot of their meeting pattern that lowers the peak the most,
+never creating an instructor or room clash, and repeats until a full pass
+makes no move. Each move is returned as an assign_time edit.
+"""
+import numpy as np
+import pandas as pd
+
+from conflicts import DAYS, time_to_minutes
+
+
+BIN = 5
+NBINS = 24 * 60 // BIN
+
+# meeting pattern -> standard start times (HHMM)
+STANDARD_SLOTS = {
+    'MWF': [800, 900, 1000, 1100, 1200, 1300, 1400, 1500],
+    'MW': [800, 930, 1100, 1230, 1400, 1530],
+    'TR': [800, 930, 1100, 1230, 1400, 1530],
+}
+
+
+def hhmm_to_minutes(t):
+    return t // 100 * 60 + t % 100
+
+
+def footprint(days, start, end):
+    """Boolean (day, bin) mask of a meeting pattern between two minute marks."""
+    mask = np.zeros((len(DAYS), NBINS), dtype=bool)
+    rows = [DAYS.index(d) for d in days if d in DAYS]
+    mask[rows, int(start) // BIN:-(-int(end) // BIN)] = True
+    return mask
+
+
+def occupancy(fps, codes, n):
+    """Per-key (day, bin) meeting counts, built from the section footprints."""
+    occ = np.zeros((n, len(DAYS), NBINS), dtype=np.int16)
+    for code, fp in zip(codes, fps):
+        if code >= 0:
+            occ[code] += fp
+    return occ
+
+
+def score(demand):
+    return demand.max(), int((demand.astype(np.int64) ** 2).sum())
+
+
+def scheduled(df):
+    return (df['Meeting Days'].notna() & df['Beginning Time'].notna()).to_numpy()
+
+
+def peak_demand(df):
+    """Highest number of in-person meetings at the same time, with the (day, HH:MM) it happens."""
+    sf = df[scheduled(df) & df['Room'].notna().to_numpy()]
+    start, end = time_to_minutes(sf['Beginning Time']), time_to_minutes(sf['Ending Time'])
+    demand = np.zeros((len(DAYS), NBINS), dtype=np.int64)
+    for d, s, e in zip(sf['Meeting Days'].str.upper(), start, end):
+        if not (pd.isna(s) or pd.isna(e)):
+            demand += footprint(d, s, e)
+    day, b = np.unravel_index(demand.argmax(), demand.shape)
+    return int(demand.max()), (DAYS[day], f'{b * BIN // 60}:{b * BIN % 60:02d}')
+
+
+def rebalance(df, movable=None, slots=STANDARD_SLOTS, max_passes=10):
+    """
+    Propose assign_time edits that lower peak room demand.
+    `movable` is a boolean mask over the rows of `df` selecting the sections
+    that may move (default: every in-person section with a standard pattern).
+    Sections keep their days, duration, room and instructor.
+    """
+    keep = scheduled(df)
+    if movable is not None:
+        movable = np.asarray(movable, dtype=bool)[keep]
+    sf = df[keep].reset_index(drop=True)
+    days = sf['Meeting Days'].str.upper().to_numpy()
+    start = time_to_minutes(sf['Beginning Time']).to_numpy(dtype=float, copy=True)
+    end = time_to_minutes(sf['Ending Time']).to_numpy(dtype=float, copy=True)
+    timed = ~(np.isnan(start) | np.isnan(end))
+    fps = [footprint(d, s, e) if t else np.zeros((len(DAYS), NBINS), dtype=bool)
+           for d, s, e, t in zip(days, start, end, timed)]
+
+    # Meetings without a room still block their instructor but use no room.
+    has_room = sf['Room'].notna().to_numpy()
+    instructors = pd.Index(sf['Instructor Name'].dropna().unique())
+    rooms = pd.Index(sf['Room'].dropna().unique())
+    inst_code = instructors.get_indexer(sf['Instructor Name'])
+    room_code = rooms.get_indexer(sf['Room'])
+    inst_occ = occupancy(fps, inst_code, len(instructors))
+    room_occ = occupancy(fps, room_code, len(rooms))
+    demand = np.zeros((len(DAYS), NBINS), dtype=np.int64)
+    for fp, counted in zip(fps, has_room):
+        if counted:
+            demand += fp
+
+    candidates = timed & has_room & pd.Series(days).isin(list(slots)).to_numpy()
+    if movable is not None:
+        candidates &= movable
+    order = list(np.flatnonzero(candidates))
+
+    # Candidate footprints per (pattern, duration), computed once.
+    options = {}
+    for n in order:
+        key = (days[n], end[n] - start[n])
+        if key not in options:
+            starts = [hhmm_to_minutes(t) for t in slots[days[n]]]
+            options[key] = (starts, np.stack([footprint(days[n], s, s + key[1]) for s in starts]))
+
+    original = start.copy()
+    for _ in range(max_passes):
+        moved = False
+        # Sections sitting in the current peak get the first chance to move.
+        peak = demand == demand.max()
+        order.sort(key=lambda n: not (fps[n] & peak).any())
+        for n in order:
+            fp = fps[n]
+            duration = end[n] - start[n]
+            starts, options_fp = options[(days[n], duration)]
+            demand -= fp
+            free = np.ones(len(starts), dtype=bool)
+            if inst_code[n] >= 0:
+                busy = inst_occ[inst_code[n]] - fp
+                free &= ~(options_fp & (busy > 0)).any(axis=(1, 2))
+            busy = room_occ[room_code[n]] - fp
+            free &= ~(options_fp & (busy > 0)).any(axis=(1, 2))
+
+            trial = demand[None] + options_fp
+            peaks = trial.max(axis=(1, 2))
+            spread = (trial ** 2).sum(axis=(1, 2))
+            best, best_score = None, score(demand + fp)
+            for k in np.flatnonzero(free):
+                if (peaks[k], spread[k]) < best_score:
+                    best, best_score = k, (peaks[k], spread[k])
+
+            if best is None:
+                demand += fp
+                continue
+            new_fp = options_fp[best]
+            demand += new_fp
+            if inst_code[n] >= 0:
+                inst_occ[inst_code[n]] += new_fp.astype(np.int16) - fp
+            room_occ[room_code[n]] += new_fp.astype(np.int16) - fp
+            fps[n] = new_fp
+            start[n], end[n] = starts[best], starts[best] + duration
+            moved = True
+        if not moved:
+            break
+
+    edits = []
+    for n in sorted(order):
+        if start[n] == original[n]:
+            continue
+        row = sf.iloc[n]
+        edits.append({
+            'op': 'assign_time',
+            'subject': row['Subject'],
+            'cnumber': row['Number'],
+            'section': row['Section'],
+            'newtime': int(start[n]) // 60 * 100 + int(start[n]) % 60,
+            'days': row['Meeting Days'],
+            'duration': int(end[n] - start[n]),
+        })
+    return edits
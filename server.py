@@ -0,0 +1,230 @@
+import argparse
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from changingsections import EDITS, apply_edits
+from readfiles import read_from_file
+from conflicts import check_instructor_conflicts_matrix, check_room_conflicts_matrix
+from generateoutput import generate_reports, schedule_tables
+from exportfiles import table_to_bytes, MIME_TYPES
+from normalize import without_key
+
+
+class Busy(Exception):
+    pass
+
+
+class ScheduleService:
+    """
+    Parsed schedules kept in memory by content hash, with the heavy work
+    (parsing, reports, Excel) run in a bounded worker pool.
+    """
+
+    def __init__(self, workers=4, queue=16, max_schedules=32):
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.max_schedules = max_schedules
+        self.schedules = OrderedDict()
+        self.results = {}
+        self.lock = threading.Lock()
+
+    def run(self, fn, *args, timeout=300):
+        if not self.slots.acquire(blocking=False):
+            raise Busy()
+        try:
+            future = self.pool.submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        # The slot is freed when the job ends, not when the caller gives up
+        # waiting, so jobs that time out still count against the bound.
+        future.add_done_callback(lambda _: self.slots.release())
+        return future.result(timeout=timeout)
+
+    def put(self, key, df):
+        with self.lock:
+            self.schedules[key] = df
+            self.schedules.move_to_end(key)
+            while len(self.schedules) > self.max_schedules:
+                old, _ = self.schedules.popitem(last=False)
+                self.results = {k: v for k, v in self.results.items() if k[0] != old}
+        return key
+
+    def get(self, key):
+        with self.lock:
+            self.schedules.move_to_end(key)
+            return self.schedules[key]
+
+    def cached(self, key, name, fn):
+        with self.lock:
+            if (key, name) in self.results:
+                return self.results[(key, name)]
+        df = self.get(key)
+        result = self.run(fn, df)
+        with self.lock:
+            self.results[(key, name)] = result
+        return result
+
+    def upload(self, data, name):
+        key = hashlib.sha256(data).hexdigest()
+        with self.lock:
+            if key in self.schedules:
+                return key
+        buffer = io.BytesIO(data)
+        buffer.name = name
+        return self.put(key, self.run(read_from_file, buffer))
+
+    def edit(self, key, op, args):
+        if op not in EDITS:
+            raise ValueError(f'Unknown edit: {op}')
+        new_key = hashlib.sha256(f'{key}{op}{json.dumps(args, sort_keys=True)}'.encode()).hexdigest()
+        with self.lock:
+            if new_key in self.schedules:
+                return new_key
+        df = apply_edits(self.get(key).copy(), [{'op': op, **args}])
+        return self.put(new_key, df)
+
+
+def conflicts_of(df):
+    return {
+        'instructor': check_instructor_conflicts_matrix(df),
+        'room': check_room_conflicts_matrix(df),
+    }
+
+
+def records(df):
+    return json.loads(df.to_json(orient='records', default_handler=str))
+
+
+def reports_of(df):
+    reports = generate_reports(df)
+    reports['constraint_violations'] = records(reports['constraint_violations'])
+    return reports
+
+
+def workbook_of(kind):
+    def render(df):
+        import openpyxl
+        import excelsheets
+        wb = openpyxl.Workbook()
+        wb.remove(wb.active)
+        getattr(excelsheets, f'{kind}_excel')(wb, df)
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        return buffer.getvalue()
+    return render
+
+
+def table_of(name):
+    def render(df):
+        return table_to_bytes(schedule_tables(df)[name], 'xlsx')
+    return render
+
+
+WORKBOOKS = {
+    'instructor': workbook_of('instructor'),
+    'room': workbook_of('room'),
+    'argos': table_of('schedule_argos'),
+    'ad': table_of('schedule_ad'),
+    'schedule': table_of('schedule'),
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    service = None
+
+    def send_json(self, obj, status=HTTPStatus.OK):
+        body = json.dumps(obj, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_bytes(self, data, filename):
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', MIME_TYPES['xlsx'])
+        self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def dispatch(self, method):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split('/') if p]
+        try:
+            if parts[:1] != ['schedules']:
+                raise LookupError(url.path)
+            self.route(method, parts[1:], query)
+        except Busy:
+            self.send_json({'error': 'busy, try again'}, HTTPStatus.SERVICE_UNAVAILABLE)
+        except (KeyError, LookupError) as e:
+            self.send_json({'error': f'not found: {e}'}, HTTPStatus.NOT_FOUND)
+        except (ValueError, TypeError) as e:
+            self.send_json({'error': str(e)}, HTTPStatus.BAD_REQUEST)
+        except TimeoutError:
+            self.send_json({'error': 'timed out, try again later'}, HTTPStatus.GATEWAY_TIMEOUT)
+        except Exception as e:
+            self.log_error('%s %s failed: %r', method, self.path, e)
+            self.send_json({'error': f'{type(e).__name__}: {e}'}, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    def route(self, method, parts, query):
+        service = self.service
+        if method == 'POST' and not parts:
+            key = service.upload(self.read_body(), query.get('name', 'upload.xlsx'))
+            self.send_json({'id': key, 'rows': len(service.get(key))}, HTTPStatus.CREATED)
+        elif method == 'GET' and len(parts) == 1:
+            self.send_json(records(without_key(service.get(parts[0]))))
+        elif method == 'GET' and parts[1:] == ['conflicts']:
+            self.send_json(service.cached(parts[0], 'conflicts', conflicts_of))
+        elif method == 'GET' and parts[1:] == ['reports']:
+            self.send_json(service.cached(parts[0], 'reports', reports_of))
+        elif method == 'POST' and parts[1:] == ['edits']:
+            edit = json.loads(self.read_body() or b'{}')
+            key = service.edit(parts[0], edit.get('op'), edit.get('args', {}))
+            self.send_json({'id': key}, HTTPStatus.CREATED)
+        elif method == 'GET' and parts[1:] == ['workbook']:
+            kind = query.get('kind', 'schedule')
+            data = service.cached(parts[0], f'workbook_{kind}', WORKBOOKS[kind])
+            self.send_bytes(data, f'schedule_{kind}.xlsx')
+        else:
+            raise LookupError('/'.join(parts))
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+
+def serve(host='127.0.0.1', port=8000, workers=4):
+    Handler.service = ScheduleService(workers=workers)
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    print(f'Serving on http://{host}:{port}')
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        Handler.service.pool.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local schedule API service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers)
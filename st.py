@@ -1,46 +1,125 @@
 import streamlit as st
 import io
-import openpyxl
 
 from readfiles import read_from_file
-from generateoutput import generate_reports, room_excel, instructor_excel
+from generateoutput import schedule_tables, report_table
+from summaries import summarize
+from normalize import without_key
+from exportfiles import zip_tables, export_formats, MIME_TYPES
+from conflicts import (
+    check_instructor_conflicts_matrix,
+    md_instructor_matrix_conflicts,
+    check_room_conflicts_matrix,
+    md_room_matrix_conflicts,
+)
 
 
+VIEWS = [
+    "Conflicts",
+    'Credits',
+    "Instructors",
+    "Rooms",
+    "Courses",
+    "Time slots",
+    "Excel"
+]
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+@st.cache_data
+def load_schedule(data, name):
+    buffer = io.BytesIO(data)
+    buffer.name = name
+    return read_from_file(buffer)
+
+
+@st.cache_data
+def load_conflicts(df):
+    instructor_conflicts = check_instructor_conflicts_matrix(df)
+    room_conflicts = check_room_conflicts_matrix(df)
+    return instructor_conflicts, room_conflicts
+
+
+@st.cache_data
+def load_report(df, name):
+    return report_table(df, name)
+
+
+@st.cache_data
+def load_summary(df):
+    summary = summarize(df)
+    return summary.instructors, summary.courses, summary.modality
+
+
+def workbook_buffer(df, build):
+    import openpyxl
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    build(wb, df)
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+@st.cache_data
+def load_workbooks(df):
+    from excelsheets import room_excel, instructor_excel
+    return workbook_buffer(df, instructor_excel), workbook_buffer(df, room_excel)
+
+
+@st.cache_data
+def load_zip(df, formats, with_workbooks):
+    extra_files = None
+    if with_workbooks:
+        buffer_u, buffer_r = load_workbooks(df)
+        extra_files = {'schedule_instructor.xlsx': buffer_u, 'schedule_room.xlsx': buffer_r}
+    return zip_tables(schedule_tables(df), formats, extra_files=extra_files).getvalue()
+
+
+def filter_table(table, key):
+    """Search box plus instructor/room/course filters over a report table."""
+    query = st.text_input("Search", key=f"{key}_search")
+    cols = st.columns(3)
+    for col, field in zip(cols, ['Instructor', 'Room', 'Course']):
+        options = sorted(table[field].dropna().astype(str).unique())
+        with col:
+            chosen = st.multiselect(field, options, key=f"{key}_{field}")
+        if chosen:
+            table = table[table[field].astype(str).isin(chosen)]
+    if query:
+        hits = table.astype(str).apply(
+            lambda c: c.str.contains(query, case=False, regex=False)
+        ).any(axis=1)
+        table = table[hits]
+    return table
+
+
+def paginate(table, key):
+    col1, col2 = st.columns(2)
+    with col1:
+        size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_size")
+    pages = max(1, -(-len(table) // size))
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    st.caption(f"{len(table)} rows, page {page} of {pages}")
+    start = (page - 1) * size
+    st.dataframe(table.iloc[start:start + size], hide_index=True, use_container_width=True)
+
 
 def main():
     st.title("ATU MAPS Class Schedule Processor beta 0.3.4")
     st.markdown('You may need to manually add a column called `Cross-List`')
     uploaded_file = st.file_uploader("Upload Excel file", type=['xlsx', 'xls'])
-    
+
     if uploaded_file is not None:
-        df = read_from_file(uploaded_file)
-
-        reports = generate_reports(df)
-
-        instructor_conflicts = reports['instructor_conflicts']
-        ic = reports['instructor_conflicts_text']
-        room_conflicts = reports['room_conflicts']
-        rc = reports['room_conflicts_text']
-        t = reports['schedule_time']
-        n = reports['schedule_instructor']
-        c = reports['schedule_course']
-        r = reports['schedule_room']
-        h = reports['instructor_credits']
-
-        if (not instructor_conflicts) and (not room_conflicts):
-            wbu = openpyxl.Workbook()
-            wbu.remove(wbu.active)
-            instructor_excel(wbu, df)
-            buffer_u = io.BytesIO()
-            wbu.save(buffer_u)
-            buffer_u.seek(0)
-            
-            wbr = openpyxl.Workbook()
-            wbr.remove(wbr.active)
-            room_excel(wbr, df)
-            buffer_r = io.BytesIO()
-            wbr.save(buffer_r)
-            buffer_r.seek(0)
+        df = load_schedule(uploaded_file.getvalue(), uploaded_file.name)
+
+        instructor_conflicts, room_conflicts = load_conflicts(df)
+        no_conflicts = (not instructor_conflicts) and (not room_conflicts)
+
+        if no_conflicts:
+            buffer_u, buffer_r = load_workbooks(df)
 
             col1, col2 = st.columns(2)
 
@@ -59,33 +138,45 @@ def main():
                     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                 )
 
-        tabs = st.tabs([
-            "Conflicts",
-            'Credits',
-            "Instructors",
-            "Rooms",
-            "Courses",
-            "Time slots",
-            "Excel"
-        ])
-
-        with tabs[0]:
+        formats = st.multiselect(
+            "Export formats", export_formats(), default=['xlsx']
+        )
+        # The zip is only rendered once asked for; load_zip keeps it for
+        # later reruns. The instructor and room workbooks are only built
+        # without conflicts.
+        zip_key = (uploaded_file.name, uploaded_file.size, tuple(formats))
+        if formats and st.button("Prepare All Tables (zip)"):
+            st.session_state['zip_key'] = zip_key
+        if formats and st.session_state.get('zip_key') == zip_key:
+            st.download_button(
+                "Download All Tables (zip)",
+                data=load_zip(df, tuple(formats), no_conflicts),
+                file_name='schedule.zip',
+                mime=MIME_TYPES['zip']
+            )
+
+        # Only the selected view is rendered, unlike st.tabs which renders
+        # every tab on every rerun.
+        view = st.radio("View", VIEWS, horizontal=True, label_visibility="collapsed")
+
+        if view == "Conflicts":
+            ic = md_instructor_matrix_conflicts(instructor_conflicts)
+            rc = md_room_matrix_conflicts(room_conflicts)
             st.markdown(f'{ic}{rc}')
-        with tabs[1]:
-            st.markdown(h)
-        with tabs[2]:
-            st.markdown(n)
-        with tabs[3]:
-            st.markdown(r)
-        with tabs[4]:
-            st.markdown(c)
-        with tabs[5]:
-            st.markdown(t)
-        with tabs[6]:
+        elif view == 'Credits':
+            instructors, courses, modality = load_summary(df)
+            st.dataframe(instructors, use_container_width=True)
+            st.dataframe(courses, use_container_width=True)
+            st.dataframe(modality.rename('sections'))
+        elif view == "Excel":
             st.write("File processed successfully")
-            st.write(f"Rows: {len(df)}, Columns: {len(df.columns)}")
-            st.dataframe(df)
+            table = without_key(df)
+            st.write(f"Rows: {len(table)}, Columns: {len(table.columns)}")
+            paginate(table, "excel")
+        else:
+            table = filter_table(load_report(df, view), view)
+            paginate(table, view)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
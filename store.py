@@ -0,0 +1,324 @@
+import json
+import sqlite3
+from datetime import datetime, time
+
+import numpy as np
+import pandas as pd
+
+from readfiles import read_from_file, parse_time
+from exportfiles import write_tables
+from generateoutput import schedule_tables
+from normalize import credits_from_number, key_parts
+from changingsections import EDITS
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL,
+    name TEXT NOT NULL,
+    created TEXT NOT NULL,
+    UNIQUE (term, name)
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    scenario_id INTEGER NOT NULL REFERENCES scenarios(id) ON DELETE CASCADE,
+    subject TEXT,
+    number TEXT,
+    section TEXT,
+    instructor TEXT,
+    days TEXT,
+    begin_min INTEGER,
+    end_min INTEGER,
+    room TEXT,
+    credits INTEGER,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sections_key ON sections (scenario_id, subject, number, section);
+CREATE INDEX IF NOT EXISTS idx_sections_instructor ON sections (scenario_id, instructor);
+CREATE INDEX IF NOT EXISTS idx_sections_room ON sections (scenario_id, room);
+CREATE TABLE IF NOT EXISTS meetings (
+    section_id INTEGER NOT NULL REFERENCES sections(id) ON DELETE CASCADE,
+    scenario_id INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    begin_min INTEGER NOT NULL,
+    end_min INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_meetings_slot ON meetings (scenario_id, day, begin_min);
+CREATE INDEX IF NOT EXISTS idx_meetings_section ON meetings (section_id);
+CREATE TABLE IF NOT EXISTS edits (
+    id INTEGER PRIMARY KEY,
+    scenario_id INTEGER NOT NULL REFERENCES scenarios(id) ON DELETE CASCADE,
+    op TEXT NOT NULL,
+    args TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+"""
+
+# DataFrame column -> sections column
+COLUMNS = {
+    'Subject': 'subject',
+    'Number': 'number',
+    'Section': 'section',
+    'Instructor Name': 'instructor',
+    'Meeting Days': 'days',
+    'Beginning Time': 'begin_min',
+    'Ending Time': 'end_min',
+    'Room': 'room',
+    'Credits': 'credits',
+}
+
+DAYS = 'MTWRF'
+
+
+def to_minutes(t):
+    if pd.isna(t):
+        return None
+    return t.hour * 60 + t.minute
+
+
+def from_minutes(m):
+    if m is None or pd.isna(m):
+        return np.nan
+    return time(int(m) // 60, int(m) % 60)
+
+
+def to_sql_value(v):
+    if isinstance(v, (list, tuple, np.ndarray)):
+        return v
+    if pd.isna(v):
+        return None
+    if isinstance(v, np.generic):
+        return v.item()
+    if isinstance(v, (time, datetime, pd.Timestamp)):
+        return v.isoformat()
+    return v
+
+
+def open_store(path='schedule.db'):
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def list_scenarios(conn):
+    return pd.read_sql_query('SELECT term, name, created FROM scenarios ORDER BY term, name', conn)
+
+
+def scenario_id(conn, term, scenario='base', create=False):
+    row = conn.execute(
+        'SELECT id FROM scenarios WHERE term = ? AND name = ?', (term, scenario)
+    ).fetchone()
+    if row is not None:
+        return row[0]
+    if not create:
+        raise KeyError(f'No scenario {scenario!r} for term {term!r}')
+    cur = conn.execute(
+        'INSERT INTO scenarios (term, name, created) VALUES (?, ?, ?)',
+        (term, scenario, datetime.now().isoformat(timespec='seconds'))
+    )
+    return cur.lastrowid
+
+
+def insert_meetings(conn, sid, section_id, days, begin_min, end_min):
+    if days is None or begin_min is None or end_min is None:
+        return
+    conn.executemany(
+        'INSERT INTO meetings (section_id, scenario_id, day, begin_min, end_min) VALUES (?, ?, ?, ?, ?)',
+        [(section_id, sid, d, begin_min, end_min) for d in days if d in DAYS]
+    )
+
+
+def insert_section(conn, sid, row):
+    values = {
+        'subject': to_sql_value(row.get('Subject')),
+        'number': None if pd.isna(row.get('Number')) else str(row.get('Number')),
+        'section': to_sql_value(row.get('Section')),
+        'instructor': to_sql_value(row.get('Instructor Name')),
+        'days': to_sql_value(row.get('Meeting Days')),
+        'begin_min': to_minutes(row.get('Beginning Time', np.nan)),
+        'end_min': to_minutes(row.get('Ending Time', np.nan)),
+        'room': to_sql_value(row.get('Room')),
+        'credits': to_sql_value(row.get('Credits')),
+    }
+    # Key is derived from Subject/Number/Section, so it is not stored.
+    extra = {k: to_sql_value(v) for k, v in row.items() if k not in COLUMNS and k != 'Key'}
+    cur = conn.execute(
+        'INSERT INTO sections (scenario_id, subject, number, section, instructor, days, '
+        'begin_min, end_min, room, credits, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (sid, *values.values(), json.dumps(extra))
+    )
+    insert_meetings(conn, sid, cur.lastrowid, values['days'], values['begin_min'], values['end_min'])
+
+
+def import_schedule(conn, df, term, scenario='base'):
+    """Store `df` as `scenario` of `term`, replacing whatever was there."""
+    with conn:
+        sid = scenario_id(conn, term, scenario, create=True)
+        conn.execute('DELETE FROM sections WHERE scenario_id = ?', (sid,))
+        conn.execute('DELETE FROM meetings WHERE scenario_id = ?', (sid,))
+        conn.execute('DELETE FROM edits WHERE scenario_id = ?', (sid,))
+        for row in df.to_dict('records'):
+            insert_section(conn, sid, row)
+    return sid
+
+
+def import_file(conn, filename, term, scenario='base'):
+    return import_schedule(conn, read_from_file(filename), term, scenario)
+
+
+def load_schedule(conn, term, scenario='base'):
+    sid = scenario_id(conn, term, scenario)
+    rows = conn.execute(
+        'SELECT subject, number, section, instructor, days, begin_min, end_min, room, credits, extra '
+        'FROM sections WHERE scenario_id = ? ORDER BY id', (sid,)
+    ).fetchall()
+    records = []
+    for subject, number, section, instructor, days, begin_min, end_min, room, credits, extra in rows:
+        record = {
+            'Subject': subject,
+            'Number': number,
+            'Section': section,
+            'Instructor Name': instructor,
+            'Meeting Days': days if days is not None else np.nan,
+            'Beginning Time': from_minutes(begin_min),
+            'Ending Time': from_minutes(end_min),
+            'Room': room if room is not None else np.nan,
+            'Credits': credits,
+        }
+        record.update({k: np.nan if v is None else v for k, v in json.loads(extra).items()})
+        records.append(record)
+    return pd.DataFrame(records, columns=None if records else list(COLUMNS))
+
+
+def copy_scenario(conn, term, source, target):
+    """Branch `target` off `source` so edits can be tried without touching it."""
+    return import_schedule(conn, load_schedule(conn, term, source), term, target)
+
+
+def section_where(subject, cnumber, section, days=None):
+    sql = 'scenario_id = ? AND subject = ? AND number = ? AND section = ?'
+    args = list(key_parts(subject, cnumber, section))
+    if days is not None:
+        sql += ' AND days = ?'
+        args.append(days)
+    return sql, args
+
+
+def section_ids(conn, sid, sql, args):
+    return [r[0] for r in conn.execute(f'SELECT id FROM sections WHERE {sql}', [sid, *args])]
+
+
+def refresh_meetings(conn, sid, ids):
+    for section_id in ids:
+        conn.execute('DELETE FROM meetings WHERE section_id = ?', (section_id,))
+        row = conn.execute(
+            'SELECT days, begin_min, end_min FROM sections WHERE id = ?', (section_id,)
+        ).fetchone()
+        insert_meetings(conn, sid, section_id, *row)
+
+
+def apply_edit(conn, term, scenario, op, **kwargs):
+    """
+    Apply one edit to a stored scenario and log it in the edits table.
+    `op` and its keyword arguments mirror the changingsections.py helpers.
+    """
+    if op not in EDITS:
+        raise ValueError(f'Unknown edit: {op}')
+    with conn:
+        sid = scenario_id(conn, term, scenario)
+        subject, cnumber, section = kwargs['subject'], kwargs['cnumber'], kwargs['section']
+        if op == 'assign_section':
+            sql, args = section_where(subject, cnumber, section)
+            conn.execute(f'UPDATE sections SET instructor = ? WHERE {sql}', [kwargs['instructor'], sid, *args])
+        elif op == 'assign_room':
+            sql, args = section_where(subject, cnumber, section, kwargs.get('days'))
+            conn.execute(f'UPDATE sections SET room = ? WHERE {sql}', [kwargs['room'], sid, *args])
+        elif op == 'assign_time':
+            begin = to_minutes(parse_time(str(kwargs['newtime'])))
+            end = begin + kwargs.get('duration', 50)
+            sql, args = section_where(subject, cnumber, section, kwargs.get('days'))
+            ids = section_ids(conn, sid, sql, args)
+            conn.executemany(
+                'UPDATE sections SET begin_min = ?, end_min = ? WHERE id = ?', [(begin, end, i) for i in ids]
+            )
+            refresh_meetings(conn, sid, ids)
+        elif op == 'assign_days':
+            sql, args = section_where(subject, cnumber, section, kwargs['olddays'])
+            ids = section_ids(conn, sid, sql, args)
+            conn.executemany('UPDATE sections SET days = ? WHERE id = ?', [(kwargs['newdays'], i) for i in ids])
+            refresh_meetings(conn, sid, ids)
+        elif op == 'remove_section':
+            sql, args = section_where(subject, cnumber, section)
+            conn.execute(f'DELETE FROM sections WHERE {sql}', [sid, *args])
+        elif op == 'add_section':
+            subject, cnumber, section = key_parts(subject, cnumber, section)
+            insert_section(conn, sid, {
+                'Subject': subject,
+                'Number': cnumber,
+                'Section': section,
+                'Instructor Name': kwargs['instructor'],
+                'Credits': credits_from_number(pd.Series([cnumber])).iloc[0],
+                'Meeting Days': kwargs.get('days', np.nan),
+                'Beginning Time': parse_time(str(kwargs.get('btime', np.nan))),
+                'Ending Time': parse_time(str(kwargs.get('etime', np.nan))),
+                'Room': kwargs.get('room', np.nan),
+            })
+        conn.execute(
+            'INSERT INTO edits (scenario_id, op, args, created) VALUES (?, ?, ?, ?)',
+            (sid, op, json.dumps(kwargs, default=str), datetime.now().isoformat(timespec='seconds'))
+        )
+
+
+def list_edits(conn, term, scenario='base'):
+    sid = scenario_id(conn, term, scenario)
+    return pd.read_sql_query(
+        'SELECT id, op, args, created FROM edits WHERE scenario_id = ? ORDER BY id', conn, params=(sid,)
+    )
+
+
+# Part-of-term dates are kept as ISO text in sections.extra; a missing
+# start/end date means the section runs from the start/to the end of term.
+START_DATE = "COALESCE(json_extract({s}.extra, '$.\"Start Date\"'), '')"
+END_DATE = "COALESCE(json_extract({s}.extra, '$.\"End Date\"'), '9999')"
+
+
+def overlapping_meetings(conn, term, scenario, column):
+    """
+    Pairs of meetings sharing `column` (instructor or room) whose times
+    overlap on the same day and whose date ranges overlap, like conflicts.py.
+    """
+    sid = scenario_id(conn, term, scenario)
+    query = f"""
+        SELECT s1.{column} AS {column}, m1.day AS day,
+               MIN(m1.begin_min, m2.begin_min) AS begin_min,
+               s1.subject || s1.number || '-' || s1.section AS course_1,
+               s2.subject || s2.number || '-' || s2.section AS course_2
+        FROM meetings m1
+        JOIN meetings m2
+          ON m2.scenario_id = m1.scenario_id AND m2.day = m1.day
+         AND m2.begin_min < m1.end_min AND m2.begin_min >= m1.begin_min
+         AND m2.section_id != m1.section_id
+        JOIN sections s1 ON s1.id = m1.section_id
+        JOIN sections s2 ON s2.id = m2.section_id
+        WHERE m1.scenario_id = ? AND s1.{column} IS NOT NULL AND s1.{column} = s2.{column}
+          AND (m2.begin_min > m1.begin_min OR m2.section_id > m1.section_id)
+          AND {START_DATE.format(s='s1')} <= {END_DATE.format(s='s2')}
+          AND {START_DATE.format(s='s2')} <= {END_DATE.format(s='s1')}
+        ORDER BY 1, 2, 3
+    """
+    return pd.read_sql_query(query, conn, params=(sid,))
+
+
+def instructor_conflicts(conn, term, scenario='base'):
+    return overlapping_meetings(conn, term, scenario, 'instructor')
+
+
+def room_conflicts(conn, term, scenario='base'):
+    return overlapping_meetings(conn, term, scenario, 'room')
+
+
+def export_schedule(conn, term, scenario='base', folder='out', formats=('xlsx',)):
+    """Write the stored scenario back out through write_into_argos / write_into_ad."""
+    return write_tables(schedule_tables(load_schedule(conn, term, scenario)), folder, formats)
@@ -0,0 +1,184 @@
+"""
+Instructor load and section summary tables.
+
+summarize(df) builds the per-section rows once and derives every aggregate
+(credits, contact hours, section counts, rooms, online/in-person) from them.
+The result is cached for that schedule together with a hash of each row, so
+the next summarize() recomputes only the sections whose rows changed, however
+they were edited. The changingsections.py helpers also call touch() so the
+cache follows the new frame returned by remove_section/add_section.
+"""
+import weakref
+
+import pandas as pd
+
+from conflicts import time_to_minutes
+from normalize import keys_of, key_of
+
+
+KEY = ['Key', 'Subject', 'Number', 'Section', 'Instructor Name']
+
+# Columns the summaries read; a change in any of them dirties the section.
+COLUMNS = ['Subject', 'Number', 'Section', 'Instructor Name', 'Credits',
+           'Meeting Days', 'Beginning Time', 'Ending Time', 'Room']
+
+SUMMARIES = {}
+
+
+def row_table(df):
+    """Per-row facts: credits, weekly minutes, online flag, room."""
+    days = df['Meeting Days'].fillna('').str.upper().str.count('[MTWRF]')
+    minutes = (time_to_minutes(df['Ending Time']) - time_to_minutes(df['Beginning Time'])) * days
+    return pd.DataFrame({
+        'Key': keys_of(df),
+        'Subject': df['Subject'],
+        'Number': df['Number'].astype(str),
+        'Section': df['Section'].astype(str),
+        'Instructor Name': df['Instructor Name'],
+        'Credits': df['Credits'],
+        'minutes': minutes.fillna(0),
+        'online': df['Meeting Days'].isna() | df['Beginning Time'].isna(),
+        'Room': df['Room'],
+    })
+
+
+def row_hashes(df):
+    """One content hash per row of the summarized columns (row order and index ignored)."""
+    return pd.util.hash_pandas_object(df[COLUMNS].assign(Key=keys_of(df)), index=False).to_numpy()
+
+
+def changed_keys(old_hashes, old_keys, new_hashes, new_keys):
+    """Keys of the rows that are not in both versions of the schedule the same number of times."""
+    counts = pd.Series(old_hashes).value_counts().sub(pd.Series(new_hashes).value_counts(), fill_value=0)
+    changed = counts.index[counts != 0].to_numpy()
+    return set(old_keys[pd.Series(old_hashes).isin(changed).to_numpy()]) | \
+        set(new_keys[pd.Series(new_hashes).isin(changed).to_numpy()])
+
+
+def section_table(rows):
+    return rows.groupby(KEY, sort=False, dropna=False).agg(
+        credits=('Credits', 'first'),
+        minutes=('minutes', 'sum'),
+        online=('online', 'all'),
+    ).reset_index()
+
+
+def instructor_table(sections, rows):
+    sf = sections.dropna(subset=['Instructor Name'])
+    table = sf.groupby('Instructor Name').agg(
+        credits=('credits', 'sum'),
+        contact_minutes=('minutes', 'sum'),
+        sections=('credits', 'size'),
+        online=('online', 'sum'),
+    )
+    rooms = rows.dropna(subset=['Instructor Name', 'Room']).groupby('Instructor Name')['Room']
+    table['contact_hours'] = (table.pop('contact_minutes') / 60).round(2)
+    table['in_person'] = table['sections'] - table['online']
+    table['rooms'] = rooms.nunique().reindex(table.index, fill_value=0)
+    table['rooms_used'] = rooms.agg(lambda s: ', '.join(sorted(s.unique()))).reindex(table.index, fill_value='')
+    return table.astype({'credits': int, 'sections': int, 'online': int, 'in_person': int, 'rooms': int})
+
+
+def course_table(sections):
+    course = sections.drop_duplicates(['Subject', 'Number', 'Section'])
+    # max rather than first, so the result does not depend on section order.
+    table = course.groupby(['Subject', 'Number']).agg(
+        credits=('credits', 'max'),
+        sections=('credits', 'size'),
+        online=('online', 'sum'),
+    )
+    table['in_person'] = table['sections'] - table['online']
+    table['instructors'] = sections.groupby(['Subject', 'Number'])['Instructor Name'].nunique()
+    return table.astype({'sections': int, 'online': int, 'in_person': int, 'instructors': int})
+
+
+class ScheduleSummary:
+    def __init__(self, df):
+        self.rows = row_table(df)
+        self.sections = section_table(self.rows)
+        self.instructors = instructor_table(self.sections, self.rows)
+        self.courses = course_table(self.sections)
+        self.dirty = set()
+        self.sync(df)
+
+    def sync(self, df, hashes=None):
+        self.hashes = row_hashes(df) if hashes is None else hashes
+        self.keys = keys_of(df).to_numpy()
+
+    @property
+    def modality(self):
+        sf = self.sections.drop_duplicates(['Subject', 'Number', 'Section'])
+        return pd.Series({'online': int(sf['online'].sum()), 'in_person': int((~sf['online']).sum())})
+
+    def refresh(self, df):
+        """Recompute the changed sections and the instructors and courses they touch."""
+        hashes = row_hashes(df)
+        keys = self.dirty | changed_keys(self.hashes, self.keys, hashes, keys_of(df).to_numpy())
+        self.dirty = set()
+        if not keys:
+            return self
+        self.sync(df, hashes)
+
+        def hit(frame):
+            return keys_of(frame).isin(keys).to_numpy()
+
+        new_rows = row_table(df[hit(df)])
+        old_rows = self.rows[hit(self.rows)]
+        instructors = set(old_rows['Instructor Name'].dropna()) | set(new_rows['Instructor Name'].dropna())
+        courses = set(zip(old_rows['Subject'], old_rows['Number'])) | set(zip(new_rows['Subject'], new_rows['Number']))
+
+        self.rows = pd.concat([self.rows[~hit(self.rows)], new_rows])
+        self.sections = pd.concat([
+            self.sections[~hit(self.sections)], section_table(new_rows)
+        ], ignore_index=True)
+
+        sections = self.sections[self.sections['Instructor Name'].isin(instructors)]
+        rows = self.rows[self.rows['Instructor Name'].isin(instructors)]
+        self.instructors = pd.concat([
+            self.instructors[~self.instructors.index.isin(instructors)],
+            instructor_table(sections, rows),
+        ]).sort_index()
+
+        course_keys = pd.MultiIndex.from_tuples(courses, names=['Subject', 'Number'])
+        sections = self.sections[pd.MultiIndex.from_frame(self.sections[['Subject', 'Number']]).isin(course_keys)]
+        self.courses = pd.concat([
+            self.courses[~self.courses.index.isin(course_keys)],
+            course_table(sections),
+        ]).sort_index()
+        return self
+
+
+def summarize(df):
+    """The (cached, kept up to date) summary of `df`."""
+    entry = SUMMARIES.get(id(df))
+    if entry is None or entry[0]() is not df:
+        summary = ScheduleSummary(df)
+        ref = weakref.ref(df, lambda _, key=id(df): SUMMARIES.pop(key, None))
+        SUMMARIES[id(df)] = (ref, summary)
+        return summary
+    return entry[1].refresh(df)
+
+
+def touch(df, subject, cnumber, section, new_df=None):
+    """
+    Mark a section as edited in the cached summary of `df`.
+    Helpers that return a new frame pass it as `new_df` so the cached
+    summary follows the schedule instead of being rebuilt.
+    """
+    entry = SUMMARIES.get(id(df))
+    if entry is None or entry[0]() is not df:
+        return
+    summary = entry[1]
+    summary.dirty.add(key_of(subject, cnumber, section))
+    if new_df is not None:
+        SUMMARIES.pop(id(df), None)
+        ref = weakref.ref(new_df, lambda _, key=id(new_df): SUMMARIES.pop(key, None))
+        SUMMARIES[id(new_df)] = (ref, summary)
+
+
+def summary_tables(df):
+    summary = summarize(df)
+    return {
+        'instructor_load': summary.instructors.reset_index(),
+        'course_sections': summary.courses.reset_index(),
+    }
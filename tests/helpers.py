@@ -0,0 +1,19 @@
+from datetime import time
+
+import numpy as np
+
+
+def section(subject, number, sec, instructor, days, begin, end, room, **extra):
+    """One normalized schedule row; times are (hour, minute) pairs."""
+    return {
+        'Subject': subject,
+        'Number': str(number),
+        'Section': sec,
+        'Instructor Name': instructor,
+        'Meeting Days': days,
+        'Beginning Time': time(*begin) if begin else np.nan,
+        'Ending Time': time(*end) if end else np.nan,
+        'Room': room,
+        'Credits': int(str(number)[-1]),
+        **extra,
+    }
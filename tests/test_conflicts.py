@@ -0,0 +1,85 @@
+import pandas as pd
+
+from conflicts import (
+    check_instructor_conflicts_matrix,
+    check_room_conflicts_matrix,
+    md_instructor_matrix_conflicts,
+)
+from helpers import section
+from readfiles import read_from_file
+
+
+def courses(conflict):
+    return sorted(c['course'] for c in conflict['courses'])
+
+
+def test_partial_time_overlap():
+    df = pd.DataFrame([
+        section('MATH', 1003, '001', 'Smith', 'MW', (9, 0), (10, 15), 'COR 101'),
+        section('MATH', 1203, '001', 'Smith', 'MW', (10, 0), (10, 50), 'COR 102'),
+        section('MATH', 1303, '001', 'Jones', 'MW', (10, 15), (11, 5), 'COR 101'),
+    ])
+    instructor = check_instructor_conflicts_matrix(df)
+    assert [c['day'] for c in instructor] == ['M', 'W']
+    assert courses(instructor[0]) == ['MATH1003-001', 'MATH1203-001']
+    # Back-to-back meetings (10:15 end, 10:15 start) do not clash.
+    assert check_room_conflicts_matrix(df) == []
+
+
+def test_chain_of_overlaps_is_reported_pairwise():
+    df = pd.DataFrame([
+        section('MATH', 1003, '001', 'Smith', 'M', (9, 0), (10, 15), 'COR 101'),
+        section('MATH', 1203, '001', 'Smith', 'M', (10, 0), (10, 50), 'COR 102'),
+        section('MATH', 1303, '001', 'Smith', 'M', (10, 40), (11, 30), 'COR 103'),
+    ])
+    conflicts = check_instructor_conflicts_matrix(df)
+    assert [courses(c) for c in conflicts] == [
+        ['MATH1003-001', 'MATH1203-001'], ['MATH1203-001', 'MATH1303-001'],
+    ]
+
+
+def test_same_slot_is_one_conflict():
+    df = pd.DataFrame([
+        section('MATH', n, '001', 'Smith', 'TR', (9, 30), (10, 45), f'COR {n}')
+        for n in (1003, 1203, 1303)
+    ])
+    conflicts = check_instructor_conflicts_matrix(df)
+    assert [c['count'] for c in conflicts] == [3, 3]
+    report = md_instructor_matrix_conflicts(conflicts)
+    assert report.count('Conflict #') == 1
+    assert 'Smith on TR at 09:30:00 - 3 classes scheduled' in report
+
+
+def test_first_and_second_half_share_a_slot():
+    df = pd.DataFrame([
+        section('MATH', 1003, 'H1', 'Smith', 'TR', (9, 30), (10, 45), 'COR 101',
+                **{'Start Date': '2026-01-12', 'End Date': '2026-03-06'}),
+        section('MATH', 1003, 'H2', 'Smith', 'TR', (9, 30), (10, 45), 'COR 101',
+                **{'Start Date': '2026-03-16', 'End Date': '2026-05-08'}),
+    ])
+    assert check_instructor_conflicts_matrix(df) == []
+    assert check_room_conflicts_matrix(df) == []
+
+
+def test_missing_end_date_runs_to_end_of_term(tmp_path):
+    path = tmp_path / 'ad.csv'
+    pd.DataFrame({
+        'Course/Section': ['MATH 1003/001 LEC', 'MATH 1203/001 LEC', 'MATH 1303/001 LEC'],
+        'Instructor': ['Smith'] * 3,
+        'Days Met': ['MW'] * 3,
+        'Start Time': ['9:00 AM'] * 3,
+        'End Time': ['9:50 AM'] * 3,
+        'Room': ['COR 101', 'COR 102', 'COR 103'],
+        'Cross-List': [None] * 3,
+        'Start Date': ['2026-01-12', '2026-03-16', '2026-01-12'],
+        'End Date': ['2026-03-06', '2026-05-08', None],
+    }).to_csv(path, index=False)
+    df = read_from_file(str(path))
+    conflicts = check_instructor_conflicts_matrix(df)
+    # 1003 (Jan-Mar) and 1203 (Mar-May) never meet at the same time; each
+    # clashes with the open-ended 1303 on its own.
+    assert sorted((c['day'], *courses(c)) for c in conflicts) == [
+        ('M', 'MATH1003-001', 'MATH1303-001'), ('M', 'MATH1203-001', 'MATH1303-001'),
+        ('W', 'MATH1003-001', 'MATH1303-001'), ('W', 'MATH1203-001', 'MATH1303-001'),
+    ]
+    assert all(c['count'] == 2 for c in conflicts)
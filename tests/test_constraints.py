@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from constraints import check_constraints
+from generateoutput import generate_reports
+from helpers import section
+
+
+def sample():
+    return pd.DataFrame([
+        section('MATH', 1003, '001', 'Smith', 'MWF', (8, 0), (9, 50), 'COR 101'),
+        section('MATH', 2214, '001', 'Smith', 'MWF', (10, 0), (11, 50), 'COR 101'),
+        section('MATH', 3103, '001', 'Smith', 'MWF', (12, 0), (13, 50), 'COR 101'),
+        section('MATH', 4003, '001', 'Smith', 'MWF', (14, 0), (15, 50), 'ROTHWELL 12'),
+        section('CHEM', 1011, '001', 'Jones', 'MW', (9, 0), (10, 50), 'ROTHWELL 12'),
+        section('CHEM', 1011, '001', 'Jones', 'F', (9, 0), (10, 50), 'COR 101'),
+        section('CHEM', 2123, '001', 'Jones', 'MW', (11, 0), (12, 15), 'WPT 1'),
+        section('ENGL', 1013, '001', 'Jones', 'MW', (12, 20), (13, 10), 'ROTHWELL 12'),
+    ])
+
+
+def check(rule):
+    return check_constraints(sample(), [rule])
+
+
+def test_max_credits():
+    found = check({'rule': 'max_credits', 'limit': 12})
+    assert found[['instructor', 'value']].values.tolist() == [['Smith', 13]]
+    assert check({'rule': 'max_credits', 'limit': 12, 'instructors': ['Jones']}).empty
+
+
+def test_max_daily_hours():
+    found = check({'rule': 'max_daily_hours', 'limit': 6, 'name': 'six hours'})
+    assert found['rule'].unique().tolist() == ['six hours']
+    assert sorted(found['day']) == ['F', 'M', 'W']
+    assert set(found['instructor']) == {'Smith'}
+
+
+def test_building_gap():
+    found = check({'rule': 'building_gap', 'minutes': 15})
+    # Jones: ROTHWELL -> WPT and WPT -> ROTHWELL, 10 and 5 min apart.
+    # Smith: COR -> ROTHWELL, 10 min apart; COR -> COR does not count.
+    assert sorted(zip(found['course'], found['day'])) == [
+        ('CHEM 2123-001', 'M'), ('CHEM 2123-001', 'W'),
+        ('ENGL 1013-001', 'M'), ('ENGL 1013-001', 'W'),
+        ('MATH 4003-001', 'F'), ('MATH 4003-001', 'M'), ('MATH 4003-001', 'W'),
+    ]
+
+
+def test_room_type_checks_every_meeting_row():
+    found = check({'rule': 'room_type', 'courses': r'^CHEM \d+1$', 'rooms': r'^ROTHWELL'})
+    assert found[['course', 'room']].values.tolist() == [['CHEM 1011-001', 'COR 101']]
+
+
+def test_reserved_room():
+    found = check({'rule': 'reserved_room', 'rooms': r'^ROTHWELL', 'courses': r'^CHEM'})
+    assert sorted(found['course']) == ['ENGL 1013-001', 'MATH 4003-001']
+
+
+def test_unknown_rule():
+    with pytest.raises(ValueError, match='Unknown rule'):
+        check({'rule': 'no_fridays'})
+
+
+def test_no_rules_no_section():
+    df = sample()
+    assert generate_reports(df)['constraint_violations_text'] == ''
+    text = generate_reports(df, [{'rule': 'max_credits', 'limit': 20}])['constraint_violations_text']
+    assert 'No constraint violations' in text
@@ -0,0 +1,50 @@
+import pandas as pd
+
+from excelsheets import SheetCache
+from helpers import section
+
+
+def sample():
+    return pd.DataFrame([
+        section('MATH', 1003, '001', 'Smith', 'MWF', (9, 0), (9, 50), 'COR 101'),
+        section('MATH', 1203, '001', 'Jones', 'TR', (9, 30), (10, 45), 'COR 102'),
+        section('MATH', 1303, '001', 'Brown', 'MW', (13, 0), (14, 15), 'COR 103'),
+    ])
+
+
+def test_unchanged_sheets_are_reused():
+    cache = SheetCache('instructor')
+    df = sample()
+    assert cache.update(df) == ['Smith', 'Jones', 'Brown']
+    sheets = {title: cache.wb[title] for title in cache.wb.sheetnames}
+    assert cache.update(df.copy()) == []
+    assert all(cache.wb[title] is ws for title, ws in sheets.items())
+
+
+def test_only_changed_sheets_are_rebuilt():
+    cache = SheetCache('instructor')
+    df = sample()
+    cache.update(df)
+    smith = cache.wb['Smith']
+    df.loc[1, 'Meeting Days'] = 'MW'
+    assert cache.update(df) == ['Jones']
+    assert cache.wb['Smith'] is smith
+    assert cache.wb.sheetnames == ['Smith', 'Jones', 'Brown']
+
+
+def test_removed_sheets_are_dropped_and_order_kept():
+    cache = SheetCache('room')
+    df = sample()
+    cache.update(df)
+    df = pd.concat([
+        pd.DataFrame([section('STAT', 2163, '001', 'Lee', 'F', (8, 0), (8, 50), 'COR 104')]),
+        df[df['Room'] != 'COR 102'],
+    ], ignore_index=True)
+    assert cache.update(df) == ['COR 104']
+    assert cache.wb.sheetnames == ['COR 104', 'COR 101', 'COR 103']
+
+
+def test_save_writes_the_workbook(tmp_path):
+    cache = SheetCache('room')
+    cache.save(sample(), tmp_path / 'rooms.xlsx')
+    assert pd.ExcelFile(tmp_path / 'rooms.xlsx').sheet_names == ['COR 101', 'COR 102', 'COR 103']
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from changingsections import add_section, assign_room
+from generateoutput import schedule_tables
+from helpers import section
+from normalize import keys_of
+
+
+def test_missing_keys_are_derived():
+    df = pd.DataFrame([section('MATH', 1003, '001', 'Smith', 'MWF', (9, 0), (9, 50), 'COR 101')])
+    df['Key'] = keys_of(df)
+    df = add_section(df, 'MATH', 1313, '009', 'Jones')
+    df.loc[1, 'Key'] = None
+    assert keys_of(df).tolist() == ['MATH1003-001', 'MATH1313-009']
+    assert len(assign_room(df, 'MATH', 1313, '009', 'COR 202')) == 1
+    assert df.loc[1, 'Room'] == 'COR 202'
+
+
+def test_key_is_not_exported():
+    df = pd.DataFrame([section('MATH', 1003, '001', 'Smith', 'MWF', (9, 0), (9, 50), 'COR 101',
+                          Title='College Algebra', Type='LEC')])
+    df['Key'] = keys_of(df)
+    assert 'Key' not in schedule_tables(df)['schedule'].columns
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from readfiles import read_from_csv_chunks, read_from_file
+
+
+def argos(path, rows):
+    columns = ['Subject', 'Number', 'Section', 'Instructor Name', 'Meeting Days',
+               'Beginning Time', 'Ending Time', 'Building', 'Room', 'Cross-List']
+    pd.DataFrame(rows, columns=columns).to_csv(path, index=False)
+    return str(path)
+
+
+def test_filter_ignores_unrelated_bad_rows(tmp_path):
+    path = argos(tmp_path / 'university.csv', [
+        ['MATH', '1003', '001', 'Smith', 'MWF', '0900', '0950', 'COR', 101, None],
+        ['BIOL', '101L', '001', 'Brown', 'T', 'TBA', 'TBA', 'SCI', 12, None],
+        ['STAT', '2163', '001', 'Jones', 'TR', '0930', '1045', 'COR', 102, 'X1'],
+        ['MATH', '2163', '001', 'Jones', 'TR', '0930', '1045', 'COR', 102, 'X1'],
+    ])
+    df = read_from_file(path, subjects=['MATH'])
+    # The cross-listed STAT partner is kept and merged into the MATH row.
+    assert sorted(df['Subject']) == ['MATH', 'STAT-MATH']
+
+
+def test_department_filter_needs_the_column(tmp_path):
+    path = argos(tmp_path / 'university.csv', [
+        ['ENGL', '1013', '001', 'Brown', 'MWF', '0900', '0950', 'WPT', 101, None],
+    ])
+    with pytest.raises(ValueError, match='Department'):
+        read_from_file(path, departments=['MAPS'])
+
+
+def test_only_selected_cross_lists_are_kept(tmp_path):
+    path = argos(tmp_path / 'university.csv', [
+        ['MATH', '2163', '001', 'Jones', 'TR', '0930', '1045', 'COR', 102, 'X1'],
+        ['BIOL', '101L', '001', 'Brown', 'T', 'TBA', 'TBA', 'SCI', 12, 'X2'],
+        ['CHEM', '101L', '001', 'Brown', 'T', 'TBA', 'TBA', 'SCI', 12, 'X2'],
+        ['MATH', '1003', '001', 'Smith', 'MWF', '0900', '0950', 'COR', 101, None],
+        ['STAT', '2163', '001', 'Jones', 'TR', '0930', '1045', 'COR', 102, 'X1'],
+    ])
+    df = read_from_csv_chunks(path, subjects=['MATH'], chunksize=2)
+    assert sorted(df['Subject']) == ['MATH', 'MATH-STAT']
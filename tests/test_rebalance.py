@@ -0,0 +1,35 @@
+import pandas as pd
+
+from changingsections import apply_edits
+from conflicts import check_instructor_conflicts_matrix, check_room_conflicts_matrix
+from helpers import section
+from rebalance import peak_demand, rebalance
+
+
+def crowded():
+    """Eight MWF 9:00 sections in four rooms taught by four instructors, all clash-free."""
+    rows = []
+    for n in range(8):
+        begin = (9, 0) if n < 4 else (10, 0)
+        rows.append(section('MATH', 1003, f'{n + 1:03d}', f'I{n % 4}', 'MWF', begin,
+                            (begin[0], 50), f'COR {n % 4}'))
+    rows.append(section('MATH', 2214, '001', 'I0', 'TR', (9, 30), (10, 45), 'COR 0'))
+    rows.append(section('STAT', 2163, '001', 'I1', None, None, None, None))
+    return pd.DataFrame(rows)
+
+
+def test_rebalance_lowers_peak_without_conflicts():
+    df = crowded()
+    before, _ = peak_demand(df)
+    edits = rebalance(df)
+    assert edits and all(e['op'] == 'assign_time' for e in edits)
+    df = apply_edits(df, edits)
+    after, _ = peak_demand(df)
+    assert after < before
+    assert check_instructor_conflicts_matrix(df) == []
+    assert check_room_conflicts_matrix(df) == []
+
+
+def test_rebalance_keeps_fixed_sections():
+    df = crowded()
+    assert rebalance(df, movable=df['Subject'].eq('STAT')) == []
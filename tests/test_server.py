@@ -0,0 +1,62 @@
+import json
+import threading
+from http.client import HTTPConnection
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+import server
+
+UPLOAD = pd.DataFrame({
+    'Subject': ['MATH', 'MATH'],
+    'Number': ['1003', '2214'],
+    'Section': ['001', '001'],
+    'Instructor Name': ['Smith', 'Smith'],
+    'Meeting Days': ['MWF', 'MWF'],
+    'Beginning Time': ['0900', '0930'],
+    'Ending Time': ['0950', '1020'],
+    'Building': ['COR', 'COR'],
+    'Room': [101, 102],
+}).to_csv(index=False).encode()
+
+
+@pytest.fixture
+def api():
+    server.Handler.service = server.ScheduleService(workers=2)
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), server.Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    def request(method, path, body=None):
+        conn = HTTPConnection(*httpd.server_address)
+        conn.request(method, path, body)
+        response = conn.getresponse()
+        data = response.read()
+        if response.getheader('Content-Type') == 'application/json':
+            data = json.loads(data)
+        return response.status, data
+
+    yield request
+    httpd.shutdown()
+    httpd.server_close()
+    server.Handler.service.pool.shutdown()
+
+
+def test_reports_are_json(api):
+    status, body = api('POST', '/schedules?name=maps.csv', UPLOAD)
+    assert status == 201
+    status, reports = api('GET', f"/schedules/{body['id']}/reports")
+    assert status == 200
+    assert reports['constraint_violations'] == []
+    assert [c['day'] for c in reports['instructor_conflicts']] == ['M', 'W', 'F']
+
+
+def test_edits_make_a_new_schedule(api):
+    _, body = api('POST', '/schedules?name=maps.csv', UPLOAD)
+    edit = {'op': 'assign_time', 'args': {'subject': 'MATH', 'cnumber': '2214', 'section': '1', 'newtime': 1000}}
+    status, edited = api('POST', f"/schedules/{body['id']}/edits", json.dumps(edit))
+    assert status == 201 and edited['id'] != body['id']
+    _, conflicts = api('GET', f"/schedules/{edited['id']}/conflicts")
+    assert conflicts == {'instructor': [], 'room': []}
+    status, error = api('POST', f"/schedules/{body['id']}/edits", json.dumps({'op': 'drop_table'}))
+    assert status == 400 and 'Unknown edit' in error['error']
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+import store
+from conflicts import meeting_frame, overlapping_pairs
+from helpers import section
+from normalize import keys_of
+
+
+def dates(start, end):
+    return {'Start Date': pd.Timestamp(start), 'End Date': pd.Timestamp(end)}
+
+
+def sample():
+    return pd.DataFrame([
+        section('MATH', 1003, 'H1', 'Smith', 'TR', (9, 30), (10, 45), 'COR 101', **dates('2026-01-12', '2026-03-06')),
+        section('MATH', 1003, 'H2', 'Smith', 'TR', (9, 30), (10, 45), 'COR 101', **dates('2026-03-16', '2026-05-08')),
+        section('MATH', 1203, '001', 'Smith', 'TR', (10, 0), (10, 50), 'COR 102', **dates('2026-01-12', None)),
+        section('MATH', 1303, '001', 'Jones', 'MW', (9, 0), (10, 15), 'COR 102', **dates(None, None)),
+        section('MATH', 1313, '001', 'Jones', 'MW', (10, 0), (10, 50), 'COR 102', **dates(None, None)),
+        section('MATH', 1403, '001', 'Jones', 'MW', (10, 50), (11, 40), 'COR 102', **dates(None, None)),
+    ])
+
+
+@pytest.fixture
+def conn():
+    conn = store.open_store(':memory:')
+    store.import_schedule(conn, sample(), '202620')
+    return conn
+
+
+def pairs_in_memory(df, key):
+    mf, i, j = overlapping_pairs(meeting_frame(df), key)
+    course = keys_of(mf)
+    return {(mf[key][a], mf['day'][a], frozenset((course[a], course[b]))) for a, b in zip(i, j)}
+
+
+def pairs_in_store(conflicts, column):
+    return {(r[column], r['day'], frozenset((r['course_1'], r['course_2']))) for _, r in conflicts.iterrows()}
+
+
+def test_store_reports_the_same_pairs_as_conflicts(conn):
+    df = sample()
+    assert pairs_in_store(store.instructor_conflicts(conn, '202620'), 'instructor') == \
+        pairs_in_memory(df, 'Instructor Name')
+    assert pairs_in_store(store.room_conflicts(conn, '202620'), 'room') == pairs_in_memory(df, 'Room')
+    assert len(pairs_in_memory(df, 'Instructor Name')) == 6
+
+
+def test_stored_sections_can_be_edited(conn):
+    store.apply_edit(conn, '202620', 'base', 'add_section', subject='MATH', cnumber=1314,
+                     section=' 9', instructor='Jones')
+    store.apply_edit(conn, '202620', 'base', 'assign_room', subject='MATH', cnumber='1314',
+                     section='9', room='COR 202')
+    sf = store.load_schedule(conn, '202620')
+    added = sf[keys_of(sf) == 'MATH1314-9']
+    assert added[['Room', 'Credits']].values.tolist() == [['COR 202', 4]]
+    assert store.list_edits(conn, '202620')['op'].tolist() == ['add_section', 'assign_room']
+
+
+def test_unknown_edit(conn):
+    with pytest.raises(ValueError, match='Unknown edit'):
+        store.apply_edit(conn, '202620', 'base', 'drop_table')
@@ -0,0 +1,47 @@
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from changingsections import assign_section, assign_time, remove_section
+from generateoutput import md_compute_credits
+from helpers import section
+from normalize import keys_of
+from summaries import ScheduleSummary, summarize
+
+
+def sample():
+    df = pd.DataFrame([
+        section('MATH', 1003, '001', 'Smith', 'MWF', (9, 0), (9, 50), 'COR 101'),
+        section('MATH', 1003, '002', 'Smith', 'MWF', (10, 0), (10, 50), 'COR 101'),
+        section('MATH', 2214, '001', 'Jones', 'TR', (9, 30), (10, 45), 'COR 102'),
+        section('STAT', 2163, '001', 'Jones', None, None, None, None),
+    ])
+    df['Key'] = keys_of(df)
+    return df
+
+
+def assert_fresh(df):
+    cached, fresh = summarize(df), ScheduleSummary(df)
+    assert_frame_equal(cached.instructors, fresh.instructors, check_like=True)
+    assert_frame_equal(cached.courses, fresh.courses, check_like=True)
+    assert cached.modality.equals(fresh.modality)
+
+
+def test_refresh_after_edits():
+    df = sample()
+    summarize(df)
+    assign_section(df, 'MATH', 2214, '001', 'Smith')
+    assign_time(df, 'MATH', 1003, '002', 1300, duration=75)
+    assert summarize(df).instructors.loc['Smith', 'credits'] == 10
+    assert_fresh(df)
+    df = remove_section(df, 'MATH', 1003, '001')
+    assert summarize(df).instructors.loc['Smith', 'sections'] == 2
+    assert_fresh(df)
+
+
+def test_direct_edit_is_noticed():
+    df = sample()
+    summarize(df)
+    df.loc[df['Key'] == 'MATH1003-001', 'Credits'] = 10
+    assert summarize(df).instructors.loc['Smith', 'credits'] == 13
+    assert '13' in md_compute_credits(df)
+    assert_fresh(df)